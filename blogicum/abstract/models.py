@@ -22,3 +22,13 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class UpdatedModel(models.Model):
+    """Абстрактная модель. Добавляет время изменения updated_at."""
+
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Изменено')
+
+    class Meta:
+        abstract = True
@@ -1,13 +1,144 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.utils import timezone
+from django.utils.html import format_html
 
-from .models import Post, Category, Location, Comment
+from .models import Post, Category, Location, Comment, get_excerpt
+from .utils import bulk_changes, defer_changes
 
 
 admin.site.empty_value_display = 'Не задано'
 
 
+class LoadedAutocompleteSelect(AutocompleteSelect):
+    """
+    Автодополнение, которое подписывает выбранное значение
+    уже загруженным объектом вместо отдельного запроса на каждую строку.
+    """
+
+    selected_object = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = self.selected_object
+        if selected is None or [str(selected.pk)] != [
+            str(item) for item in value if item
+        ]:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name,
+            selected.pk,
+            self.choices.field.label_from_instance(selected),
+            True,
+            len(options),
+        ))
+        return [(None, options, 0)]
+
+
+class ChangeListForm(forms.ModelForm):
+    """Форма строки changelist, которая отдаёт виджетам связанные объекты."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in self.fields.items():
+            # Админка оборачивает виджет в RelatedFieldWidgetWrapper
+            widget = getattr(field.widget, 'widget', field.widget)
+            if not isinstance(widget, LoadedAutocompleteSelect):
+                continue
+            model_field = self.instance._meta.get_field(name)
+            if model_field.is_cached(self.instance):
+                widget.selected_object = model_field.get_cached_value(
+                    self.instance)
+
+
+class LoadedAutocompleteAdmin(admin.ModelAdmin):
+    """
+    Внешние ключи из autocomplete_fields выводятся виджетом с поиском,
+    а не списком всех вариантов в каждой строке changelist.
+    """
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs.setdefault('widget', LoadedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get('using')))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', ChangeListForm)
+        return super().get_changelist_form(request, **kwargs)
+
+
+class SelectedRelatedFilter(admin.RelatedFieldListFilter):
+    """
+    Фильтр по связанной записи без полного списка вариантов:
+    показывает только выбранное значение и ссылку «Все».
+    """
+
+    def field_choices(self, field, request, model_admin):
+        if not self.lookup_val:
+            return []
+        return field.get_choices(
+            include_blank=False, limit_choices_to={'pk': self.lookup_val})
+
+    def has_output(self):
+        return bool(self.lookup_val)
+
+
+class BulkModerationAdmin(LoadedAutocompleteAdmin):
+    """
+    Массовые действия выполняются одним UPDATE на пакет записей,
+    а счётчики и кэш страниц обновляются один раз на запрос.
+    """
+
+    actions = ('publish', 'unpublish')
+    bulk_batch_size = 500
+
+    def changelist_view(self, request, extra_context=None):
+        # Действия и list_editable сохраняют записи внутри bulk_changes
+        with bulk_changes():
+            return super().changelist_view(request, extra_context)
+
+    def delete_view(self, request, object_id, extra_context=None):
+        # Каскадное удаление комментариев тоже пакетное
+        with bulk_changes():
+            return super().delete_view(request, object_id, extra_context)
+
+    def get_affected_post_ids(self, ids):
+        """Посты, чей счётчик комментариев зависит от изменённых записей."""
+        return ()
+
+    def bulk_update(self, queryset, **values):
+        ids = list(queryset.values_list('pk', flat=True))
+        updated = 0
+        for start in range(0, len(ids), self.bulk_batch_size):
+            batch = ids[start:start + self.bulk_batch_size]
+            updated += self.model.objects.filter(pk__in=batch).update(**values)
+            defer_changes(self.get_affected_post_ids(batch))
+        return updated
+
+    @admin.action(description='Опубликовать выбранные', permissions=['change'])
+    def publish(self, request, queryset):
+        updated = self.bulk_update(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано записей: {updated}.')
+
+    @admin.action(
+        description='Снять выбранные с публикации', permissions=['change'])
+    def unpublish(self, request, queryset):
+        updated = self.bulk_update(queryset, is_published=False)
+        self.message_user(request, f'Снято с публикации записей: {updated}.')
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(), required=False, label='Категория')
+
+
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BulkModerationAdmin):
     list_display = (
         'title',
         'pub_date',
@@ -21,20 +152,94 @@ class PostAdmin(admin.ModelAdmin):
         'location',
         'category'
     )
+    list_select_related = ('author', 'location', 'category')
+    autocomplete_fields = ('author', 'location', 'category')
     search_fields = ('title',)
     list_display_links = ('title',)
+    show_full_result_count = False
+    actions = ('publish', 'unpublish', 'set_category')
+    action_form = PostActionForm
+
+    def bulk_update(self, queryset, **values):
+        return super().bulk_update(
+            queryset, updated_at=timezone.now(), **values)
+
+    @admin.action(
+        description='Перенести выбранные в категорию', permissions=['change'])
+    def set_category(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.full_clean()
+        category = form.cleaned_data.get('category')
+        if category is None:
+            self.message_user(
+                request, 'Выберите категорию для переноса.', messages.WARNING)
+            return
+        updated = self.bulk_update(queryset, category=category)
+        self.message_user(
+            request, f'Перенесено в «{category}» записей: {updated}.')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск идёт по полнотекстовому индексу, а не LIKE по таблице
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('title', 'description', 'slug')
+    search_fields = ('title',)
 
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = ('name',)
+    search_fields = ('name',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ('post', 'text',)
+class CommentAdmin(BulkModerationAdmin):
+    list_display = (
+        'short_text',
+        'post_link',
+        'author_link',
+        'is_published',
+        'created_at'
+    )
+    list_display_links = ('short_text',)
+    list_select_related = ('post', 'author')
+    list_filter = (
+        'is_published',
+        ('post', SelectedRelatedFilter),
+        ('author', SelectedRelatedFilter),
+    )
+    autocomplete_fields = ('post', 'author')
+    ordering = ('-created_at',)
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Из поста и автора список выводит только заголовок и имя
+        return super().get_queryset(request).only(
+            'text', 'is_published', 'created_at', 'post_id', 'author_id',
+            'post__title', 'author__username',
+        )
+
+    def get_affected_post_ids(self, ids):
+        return Comment.objects.filter(pk__in=ids).values_list(
+            'post_id', flat=True).distinct()
+
+    @admin.display(description='Текст комментария')
+    def short_text(self, comment):
+        return get_excerpt(comment.text)
+
+    @admin.display(description='Пост', ordering='post')
+    def post_link(self, comment):
+        return format_html(
+            '<a href="?post__id__exact={}">{}</a>', comment.post_id,
+            comment.post)
+
+    @admin.display(description='Автор', ordering='author')
+    def author_link(self, comment):
+        return format_html(
+            '<a href="?author__id__exact={}">{}</a>', comment.author_id,
+            comment.author.username)
@@ -1,13 +1,58 @@
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
 
 from .models import Post, Comment
 
 
+class PostImageField(forms.ImageField):
+    """
+    Картинка поста с ограничением размера файла и числа пикселей.
+    Размеры читаются из заголовка до полного декодирования, поэтому
+    «бомба» из маленького файла с огромными размерами не распаковывается.
+    """
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        if data.size > settings.POST_IMAGE_MAX_SIZE:
+            raise ValidationError(
+                'Размер файла не должен превышать '
+                f'{filesizeformat(settings.POST_IMAGE_MAX_SIZE)}.',
+                code='file_too_large',
+            )
+        if hasattr(data, 'temporary_file_path'):
+            source = data.temporary_file_path()
+        else:
+            source = data
+        try:
+            with Image.open(source) as image:
+                pixels = image.width * image.height
+        except Image.DecompressionBombError:
+            pixels = None
+        except Exception:
+            # Не картинка — ошибку сообщит стандартная проверка
+            return super().to_python(data)
+        finally:
+            if source is data:
+                data.seek(0)
+        if pixels is None or pixels > settings.POST_IMAGE_MAX_PIXELS:
+            raise ValidationError(
+                'Изображение не должно быть больше '
+                f'{settings.POST_IMAGE_MAX_PIXELS // 1_000_000} Мп.',
+                code='too_many_pixels',
+            )
+        return super().to_python(data)
+
+
 class AddPostForm(forms.ModelForm):
 
     class Meta:
         model = Post
         exclude = ('author', )
+        field_classes = {'image': PostImageField}
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format='%Y-%m-%dT%H:%M', attrs={'type': 'datetime-local'})
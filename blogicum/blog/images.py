@@ -0,0 +1,197 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path, PurePosixPath
+
+from django.conf import settings
+from django.core.files.images import get_image_dimensions
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+# Расширение файла варианта и формат Pillow, от предпочтительного.
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+VARIANT_MIME_TYPES = {'webp': 'image/webp', 'jpg': 'image/jpeg'}
+
+# Pillow отказывается открывать картинки больше удвоенного лимита,
+# в том числе в процессах нарезки вариантов.
+Image.MAX_IMAGE_PIXELS = settings.POST_IMAGE_MAX_PIXELS
+
+
+def get_file_hash(file):
+    """SHA-256 содержимого файла, читаемого по частям."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_image_metadata(image):
+    """
+    Ширина, высота, объём и хэш открытого файла картинки.
+    Размеры читаются из заголовка файла без декодирования.
+    """
+    width, height = get_image_dimensions(image)
+    return {
+        'image_width': width,
+        'image_height': height,
+        'image_size': image.size,
+        'image_hash': get_file_hash(image),
+    }
+
+
+def get_variant_widths():
+    """Ширины вариантов: карточка, страница поста и их 2x."""
+    widths = (settings.POST_IMAGE_CARD_WIDTH, settings.POST_IMAGE_DETAIL_WIDTH)
+    return sorted({*widths, *(width * 2 for width in widths)})
+
+
+def get_variant_name(name, width, extension):
+    path = PurePosixPath(name)
+    return str(path.parent / 'variants' / f'{path.stem}_{width}.{extension}')
+
+
+def render_variants(source, targets):
+    """
+    Нарезает варианты изображения; выполняется в отдельном процессе.
+    targets — пары (ширина, {расширение: путь}). Варианты шире
+    оригинала не создаются, кроме самого узкого.
+    Возвращает список [ширина, фактическая ширина, высота] вариантов.
+    """
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        sizes = []
+        for width, paths in targets:
+            if width > image.width and sizes:
+                break
+            variant = image.copy()
+            variant.thumbnail(
+                (width, variant.height), Image.Resampling.LANCZOS)
+            for extension, path in paths.items():
+                image_format, options = VARIANT_FORMATS[extension]
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                variant.save(path, image_format, **options)
+            sizes.append([width, *variant.size])
+    return sizes
+
+
+def get_render_args(image):
+    """Аргументы render_variants для файла изображения поста."""
+    storage = image.storage
+    return storage.path(image.name), [
+        (width, {
+            extension: storage.path(
+                get_variant_name(image.name, width, extension))
+            for extension in VARIANT_FORMATS
+        })
+        for width in get_variant_widths()
+    ]
+
+
+def store_variants(name, sizes):
+    """Сохраняет размеры вариантов у всех постов с этим файлом картинки."""
+    from blog.models import Post
+    from blog.utils import invalidate_page_cache
+
+    Post.objects.filter(image=name).update(
+        image_variants={'name': name, 'sizes': sizes},
+        updated_at=timezone.now(),
+    )
+    invalidate_page_cache()
+
+
+def store_future_variants(name, future):
+    close_old_connections()
+    try:
+        store_variants(name, future.result())
+    finally:
+        close_old_connections()
+
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.POST_IMAGE_WORKERS)
+    return _executor
+
+
+def schedule_variants(post):
+    """
+    Нарезает варианты картинки поста в пуле процессов после коммита.
+    При POST_IMAGE_WORKERS = 0 нарезает сразу, в текущем процессе.
+    Если тот же файл уже нарезан для другого поста, берёт его варианты.
+    """
+    from blog.models import Post
+
+    name = post.image.name
+    shared = Post.objects.filter(
+        image=name, image_variants__name=name,
+    ).values_list('image_variants', flat=True).first()
+    if shared:
+        store_variants(name, shared['sizes'])
+        return
+    args = get_render_args(post.image)
+    if not settings.POST_IMAGE_WORKERS:
+        store_variants(name, render_variants(*args))
+        return
+
+    def submit():
+        future = get_executor().submit(render_variants, *args)
+        future.add_done_callback(partial(store_future_variants, name))
+
+    transaction.on_commit(submit)
+
+
+class ResponsiveImage:
+    """Варианты картинки поста для вывода в заданную ширину."""
+
+    def __init__(self, image, sizes, display_width):
+        self.image = image
+        self.display_width = display_width
+        # Для srcset хватает вариантов до 2x от ширины вывода
+        self.sizes = [
+            size for size in sizes if size[1] <= display_width * 2
+        ] or sizes[:1]
+        fitting = [size for size in self.sizes if size[1] <= display_width]
+        self.name_width, self.width, self.height = (fitting or self.sizes)[-1]
+
+    def url(self, name_width, extension):
+        return self.image.storage.url(
+            get_variant_name(self.image.name, name_width, extension))
+
+    def get_srcset(self, extension):
+        return ', '.join(
+            f'{self.url(name_width, extension)} {width}w'
+            for name_width, width, _ in self.sizes
+        )
+
+    @property
+    def sources(self):
+        """Форматы для <source> в <picture>, кроме запасного JPEG."""
+        return [
+            {'type': VARIANT_MIME_TYPES[extension],
+             'srcset': self.get_srcset(extension)}
+            for extension in VARIANT_FORMATS if extension != 'jpg'
+        ]
+
+    @property
+    def src(self):
+        return self.url(self.name_width, 'jpg')
+
+    @property
+    def srcset(self):
+        return self.get_srcset('jpg')
+
+    @property
+    def sizes_attr(self):
+        return (
+            f'(max-width: {self.display_width}px) 100vw, '
+            f'{self.display_width}px'
+        )
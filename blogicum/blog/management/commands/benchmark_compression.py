@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from blogicum.middleware import minify_html
+from blogicum.staticfiles import brotli, compress_brotli, compress_gzip
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_LEVELS = (1, 5, 11)
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает объём страниц блога и время на их минификацию '
+        'и сжатие при разных уровнях gzip и brotli.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*', default=['/'],
+            help='Адреса страниц, по умолчанию лента.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Сколько раз повторять каждую операцию для замера.',
+        )
+
+    def measure(self, operation, content, repeat):
+        start = time.process_time()
+        for _ in range(repeat):
+            result = operation(content)
+        elapsed = (time.process_time() - start) / repeat * 1000
+        return result, elapsed
+
+    def get_variants(self):
+        variants = [('minify', lambda html: minify_html(html))]
+        for level in GZIP_LEVELS:
+            variants.append((
+                f'gzip-{level}',
+                lambda html, level=level: compress_gzip(
+                    minify_html(html).encode(), level),
+            ))
+        if brotli is not None:
+            for level in BROTLI_LEVELS:
+                variants.append((
+                    f'br-{level}',
+                    lambda html, level=level: compress_brotli(
+                        minify_html(html).encode(), level),
+                ))
+        return variants
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME='localhost')
+        repeat = options['repeat']
+        for path in options['paths']:
+            with override_settings(HTML_MINIFY=False):
+                response = client.get(path)
+            html = response.content.decode(response.charset)
+            raw_size = len(response.content)
+            self.stdout.write(f'{path} ({response.status_code})')
+            self.stdout.write(f'  {"raw":<8} {raw_size:>8} B')
+            for name, operation in self.get_variants():
+                result, elapsed = self.measure(operation, html, repeat)
+                size = len(result.encode() if isinstance(result, str)
+                           else result)
+                self.stdout.write(
+                    f'  {name:<8} {size:>8} B {size / raw_size:>6.1%} '
+                    f'{elapsed:>8.2f} ms CPU'
+                )
@@ -0,0 +1,63 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template.loader import select_template
+from django.test import Client, override_settings
+
+ENGINES = ('django', 'jinja2')
+
+# Кэш, в котором любой фрагмент отсутствует: замер полного рендеринга.
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендеринга страниц блога шаблонами Django '
+        'и Jinja2 без кэша фрагментов и с заполненным кэшем.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*', default=['/'],
+            help='Адреса страниц, по умолчанию лента.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Сколько раз рендерить каждую страницу для замера.',
+        )
+
+    def measure(self, template, context, request, repeat):
+        start = time.process_time()
+        for _ in range(repeat):
+            template.render(context, request)
+        return (time.process_time() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME='localhost')
+        repeat = options['repeat']
+        for path in options['paths']:
+            # Контекст собирается один раз, запросы к БД не входят в замер
+            with override_settings(CACHES=NO_CACHE):
+                response = client.get(path)
+            context = getattr(response, 'context_data', None)
+            if context is None:
+                self.stderr.write(
+                    f'{path} ({response.status_code}): не TemplateResponse')
+                continue
+            request = response.wsgi_request
+            self.stdout.write(f'{path} ({response.template_name[0]})')
+            for engine in ENGINES:
+                template = select_template(
+                    response.template_name, using=engine)
+                with override_settings(CACHES=NO_CACHE):
+                    cold = self.measure(template, context, request, repeat)
+                cache.clear()
+                template.render(context, request)
+                warm = self.measure(template, context, request, repeat)
+                self.stdout.write(
+                    f'  {engine:<8} без кэша {cold:>8.2f} ms CPU, '
+                    f'с кэшем фрагментов {warm:>8.2f} ms CPU'
+                )
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import get_image_metadata
+from blog.models import Post
+from blog.utils import invalidate_page_cache
+
+METADATA_FIELDS = ('image_width', 'image_height', 'image_size', 'image_hash')
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет размеры, объём и хэш картинок постов, '
+        'загруженных до появления этих полей, пачками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Количество постов, обновляемых одним запросом.',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перечитать метаданные всех картинок.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        posts_to_fill = Post.objects.exclude(image='')
+        if not options['all']:
+            posts_to_fill = posts_to_fill.filter(image_size__isnull=True)
+        last_pk = 0
+        updated = failed = 0
+        while True:
+            posts = list(
+                posts_to_fill.filter(pk__gt=last_pk).order_by('pk')
+                .only('image', *METADATA_FIELDS)[:chunk_size]
+            )
+            if not posts:
+                break
+            last_pk = posts[-1].pk
+            done = []
+            for post in posts:
+                try:
+                    with post.image.open('rb'):
+                        metadata = get_image_metadata(post.image)
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f'{post.image.name}: {error}')
+                    continue
+                for field, value in metadata.items():
+                    setattr(post, field, value)
+                post.updated_at = timezone.now()
+                done.append(post)
+            Post.objects.bulk_update(done, (*METADATA_FIELDS, 'updated_at'))
+            updated += len(done)
+        invalidate_page_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено постов: {updated}, ошибок: {failed}'))
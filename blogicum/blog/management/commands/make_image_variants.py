@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import get_render_args, render_variants
+from blog.models import Post
+from blog.utils import invalidate_page_cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Нарезает варианты картинок постов, у которых их ещё нет, '
+        'пачками в пуле процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=100,
+            help='Количество постов, обрабатываемых за один проход.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Количество процессов для нарезки.',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Нарезать заново варианты всех картинок.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        posts_with_images = Post.objects.exclude(image='')
+        last_pk = 0
+        updated = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                posts = list(
+                    posts_with_images.filter(pk__gt=last_pk).order_by('pk')
+                    .only('image', 'image_variants')[:chunk_size]
+                )
+                if not posts:
+                    break
+                last_pk = posts[-1].pk
+                futures = {
+                    executor.submit(
+                        render_variants, *get_render_args(post.image)): post
+                    for post in posts
+                    if options['all']
+                    or post.image_variants.get('name') != post.image.name
+                }
+                done = []
+                for future in as_completed(futures):
+                    post = futures[future]
+                    try:
+                        sizes = future.result()
+                    except Exception as error:
+                        failed += 1
+                        self.stderr.write(f'{post.image.name}: {error}')
+                        continue
+                    post.image_variants = {
+                        'name': post.image.name, 'sizes': sizes}
+                    post.updated_at = timezone.now()
+                    done.append(post)
+                Post.objects.bulk_update(
+                    done, ('image_variants', 'updated_at'))
+                updated += len(done)
+        invalidate_page_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено постов: {updated}, ошибок: {failed}'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.utils import update_comment_count
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count пачками по первичному ключу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Количество постов, обновляемых одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        updated = 0
+        while True:
+            post_ids = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not post_ids:
+                break
+            updated += update_comment_count(post_ids)
+            last_pk = post_ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено постов: {updated}'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post, get_excerpt, get_reading_time
+from blog.utils import invalidate_page_cache
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает анонсы и время чтения постов пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Количество постов, обновляемых одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        updated = 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                .only('text')[:chunk_size]
+            )
+            if not posts:
+                break
+            for post in posts:
+                post.excerpt = get_excerpt(post.text)
+                post.reading_time = get_reading_time(post.text)
+                post.updated_at = timezone.now()
+            Post.objects.bulk_update(
+                posts, ('excerpt', 'reading_time', 'updated_at'))
+            updated += len(posts)
+            last_pk = posts[-1].pk
+        invalidate_page_cache()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено постов: {updated}'))
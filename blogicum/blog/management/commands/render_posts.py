@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import TEXT_HTML_VERSION, Post
+from blog.utils import invalidate_page_cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Перерендеривает HTML текста постов, сохранённый '
+        'по устаревшей версии правил, пачками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Количество постов, обновляемых одним запросом.',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перерендерить все посты независимо от версии.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        posts_to_render = Post.objects.all()
+        if not options['all']:
+            posts_to_render = posts_to_render.filter(
+                text_html_version__lt=TEXT_HTML_VERSION)
+        last_pk = 0
+        updated = 0
+        while True:
+            posts = list(
+                posts_to_render.filter(pk__gt=last_pk).order_by('pk')
+                .only('text')[:chunk_size]
+            )
+            if not posts:
+                break
+            for post in posts:
+                post.update_text_html()
+                post.updated_at = timezone.now()
+            Post.objects.bulk_update(
+                posts, ('text_html', 'text_html_version', 'updated_at'))
+            updated += len(posts)
+            last_pk = posts[-1].pk
+        invalidate_page_cache()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено постов: {updated}'))
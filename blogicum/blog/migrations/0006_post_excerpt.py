@@ -0,0 +1,51 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:28
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+# Правила на момент миграции: EXCERPT_WORDS и READING_WORDS_PER_MINUTE
+# из настроек и get_excerpt/get_reading_time из blog.models.
+EXCERPT_WORDS = 10
+READING_WORDS_PER_MINUTE = 200
+
+
+def get_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def get_reading_time(text):
+    return max(1, round(len(text.split()) / READING_WORDS_PER_MINUTE))
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('text').iterator(chunk_size=500):
+        post.excerpt = get_excerpt(post.text)
+        post.reading_time = get_reading_time(post.text)
+        posts.append(post)
+        if len(posts) == 500:
+            Post.objects.bulk_update(posts, ('excerpt', 'reading_time'))
+            posts = []
+    Post.objects.bulk_update(posts, ('excerpt', 'reading_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:29
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+
+# Правила рендеринга на момент миграции, см. render_text_html
+# и TEXT_HTML_VERSION в blog.models.
+TEXT_HTML_VERSION = 1
+
+
+def render_text_html(text):
+    return linebreaksbr(text, autoescape=True)
+
+
+def fill_text_html(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('text').iterator(chunk_size=500):
+        post.text_html = render_text_html(post.text)
+        post.text_html_version = TEXT_HTML_VERSION
+        posts.append(post)
+        if len(posts) == 500:
+            Post.objects.bulk_update(
+                posts, ('text_html', 'text_html_version'))
+            posts = []
+    Post.objects.bulk_update(posts, ('text_html', 'text_html_version'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Версия рендеринга текста'),
+        ),
+        migrations.RunPython(fill_text_html, migrations.RunPython.noop),
+    ]
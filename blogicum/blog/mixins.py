@@ -1,10 +1,29 @@
+import hashlib
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
 from django.urls import reverse
 from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.utils import timezone
+from django.views.decorators.http import condition
 
 from .models import Comment
+from .paginators import CursorPaginator
+from .utils import get_page_cache_key, get_page_cache_version
+
+
+class TemplateEngineMixin:
+    """Рендерит шаблон движком из настройки BLOG_TEMPLATE_ENGINE."""
 
+    @property
+    def template_engine(self):
+        return settings.BLOG_TEMPLATE_ENGINE
 
-class CommentMixin:
+
+class CommentMixin(TemplateEngineMixin):
     model = Comment
     template_name = 'blog/comment.html'
 
@@ -23,3 +42,120 @@ class GetObjectMixin:
                 "Вы не можете редактировать или удалять этот комментарий."
             )
         return comment
+
+
+class PostVisibilityMixin:
+    """
+    Скрывает снятые с публикации и отложенные посты, а также посты
+    из неопубликованных категорий от всех, кроме автора.
+    """
+
+    def check_visibility(self, post):
+        # Автору пост доступен всегда
+        if post.author_id == self.request.user.pk:
+            return
+        # Проверка публикации поста
+        if not post.is_published:
+            raise Http404("Доступ запрещен. Пост снят с публикации.")
+        # Проверка, отложена публикация
+        if post.pub_date > timezone.now():
+            raise Http404("Доступ запрещен. Публикация отложена.")
+        # Проверка публикации категории
+        if post.category is None or not post.category.is_published:
+            raise Http404("Доступ запрещен. Категория снята с публикации.")
+
+
+class CursorPaginationMixin:
+    """
+    Курсорная пагинация ленты публикаций.
+    Включается параметром ?cursor= или настройкой FEED_CURSOR_PAGINATION;
+    ссылки вида ?page= продолжают работать через обычный Paginator.
+    """
+
+    cursor_kwarg = 'cursor'
+
+    def use_cursor_pagination(self):
+        if self.cursor_kwarg in self.request.GET:
+            return True
+        return (settings.FEED_CURSOR_PAGINATION
+                and self.page_kwarg not in self.request.GET)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    """
+    Кэширует страницу целиком для анонимных GET-запросов.
+    При попадании в кэш не выполняются ни запросы к БД, ни рендеринг.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        cache_key = get_page_cache_key(request)
+        response = cache.get(cache_key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            def store(response):
+                cache.set(cache_key, response, settings.PAGE_CACHE_TIMEOUT)
+            if hasattr(response, 'render') and callable(response.render):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Отвечает 304 Not Modified по ETag и Last-Modified.
+    Валидаторы вычисляются одним агрегирующим запросом
+    до выборки объектов и рендеринга шаблона. В них входит версия
+    кэша страниц, которую сигналы меняют при изменении постов,
+    комментариев, категорий и мест, в том числе при удалении.
+    """
+
+    def get_conditional_aggregate(self):
+        """
+        Возвращает словарь с ключами count и last_modified.
+        Отложенный пост, дата которого наступила, меняет и число
+        постов, и самую позднюю дату публикации.
+        """
+        return self.get_queryset().order_by().aggregate(
+            count=Count('id'), last_modified=Max('pub_date'))
+
+    def get_conditional_state(self):
+        if not hasattr(self, '_conditional_state'):
+            aggregate = self.get_conditional_aggregate()
+            version, changed_at = get_page_cache_version()
+            # Не раньше последнего изменения данных и не позже текущего
+            # момента, поэтому Last-Modified не уменьшается.
+            last_modified = min(
+                max(changed_at, aggregate['last_modified'] or changed_at),
+                timezone.now(),
+            )
+            etag = hashlib.md5('|'.join((
+                self.request.path,
+                self.request.GET.get('page', ''),
+                self.request.GET.get('cursor', ''),
+                str(self.request.user.pk),
+                str(aggregate['count']),
+                version,
+            )).encode()).hexdigest()
+            self._conditional_state = etag, last_modified
+        return self._conditional_state
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(
+            etag_func=lambda *args, **kwargs: (
+                self.get_conditional_state()[0]),
+            last_modified_func=lambda *args, **kwargs: (
+                self.get_conditional_state()[1]),
+        )(super().dispatch)
+        return view(request, *args, **kwargs)
@@ -1,13 +1,29 @@
-from django.db import models
+import hashlib
+import re
+
+from django.db import connections, models, transaction
+from django.db.models.expressions import RawSQL
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.template.defaultfilters import linebreaksbr
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import Truncator
 
-from abstract.models import PublishedModel, CreatedModel
+from abstract.models import PublishedModel, CreatedModel, UpdatedModel
+from .images import ResponsiveImage, get_image_metadata
+from .storage import post_image_storage, release_image
 
 User = get_user_model()
 
 
+def get_cache_version(*values):
+    """Версия фрагмента шаблона — хэш выводимых в нём значений."""
+    return hashlib.md5(
+        '\x1f'.join(str(value) for value in values).encode()
+    ).hexdigest()
+
+
 class Category(PublishedModel, CreatedModel):
     title = models.CharField(
         max_length=settings.MAX_LENGTH_TITLE, verbose_name='Заголовок')
@@ -41,7 +57,95 @@ class Location(PublishedModel, CreatedModel):
         return self.name[:settings.TITLE_LENGTH]
 
 
-class Post(PublishedModel, CreatedModel):
+def get_excerpt(text):
+    """Анонс поста — как фильтр truncatewords в карточке."""
+    return Truncator(text).words(settings.EXCERPT_WORDS, truncate=' …')
+
+
+def get_reading_time(text):
+    """Оценка времени чтения в минутах, не меньше одной."""
+    return max(1, round(len(text.split()) / settings.READING_WORDS_PER_MINUTE))
+
+
+# Версия правил рендеринга текста поста; при их изменении увеличьте
+# и запустите manage.py render_posts.
+TEXT_HTML_VERSION = 1
+
+
+def render_text_html(text):
+    """HTML текста поста — как фильтр linebreaksbr на странице поста."""
+    return linebreaksbr(text, autoescape=True)
+
+
+# Поля поста и связанных моделей, которые выводит includes/post_card.html.
+POST_CARD_FIELDS = (
+    'title', 'excerpt', 'reading_time', 'pub_date', 'is_published',
+    'image', 'image_width', 'image_height', 'image_variants',
+    'author__username',
+    'category__slug', 'category__title', 'category__is_published',
+    'location__name', 'location__is_published',
+)
+
+
+class PublishedPostQuerySet(models.QuerySet):
+    """Выборки постов для лент: фильтр видимости, карточки и счётчики."""
+
+    def published(self):
+        """Опубликованные посты с наступившей датой из открытых категорий."""
+        return self.filter(
+            is_published=True,
+            pub_date__lte=timezone.now(),
+            category__is_published=True,
+        )
+
+    def for_card(self):
+        """Загружает одним запросом только то, что выводит карточка поста."""
+        return self.select_related(
+            'author', 'category', 'location'
+        ).only(*POST_CARD_FIELDS)
+
+    def with_comment_count(self):
+        """
+        Добавляет к загружаемым полям денормализованный comment_count,
+        не отменяя ограничений only()/defer().
+        """
+        clone = self._chain()
+        field_names, defer = clone.query.deferred_loading
+        if defer:
+            field_names = field_names - {'comment_count'}
+        else:
+            field_names = field_names | {'comment_count'}
+        clone.query.deferred_loading = frozenset(field_names), defer
+        return clone
+
+    def search(self, query):
+        """
+        Полнотекстовый поиск по заголовку и тексту через FTS5,
+        от более к менее релевантным (BM25, заголовок весомее текста).
+        Слова ищутся как префиксы, что покрывает русские словоформы.
+        """
+        words = re.findall(r'\w+', query.replace('ё', 'е').replace('Ё', 'Е'))
+        if not words:
+            return self.none()
+        if connections[self.db].vendor != 'sqlite':
+            condition = models.Q()
+            for word in words:
+                condition &= (models.Q(title__icontains=word)
+                              | models.Q(text__icontains=word))
+            return self.filter(condition)
+        match = ' '.join(f'"{word}"*' for word in words)
+        # Индекс присоединяется к постам один раз: MATCH и bm25()
+        # считаются за один проход по совпадениям, а не на каждый пост
+        return self.filter(search_index__isnull=False).filter(RawSQL(
+            'blog_post_fts MATCH %s', [match],
+            output_field=models.BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            'bm25(blog_post_fts, 10.0, 1.0)', (),
+            output_field=models.FloatField(),
+        )).order_by('search_rank')
+
+
+class Post(PublishedModel, CreatedModel, UpdatedModel):
     title = models.CharField(
         max_length=settings.MAX_LENGTH_TITLE, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
@@ -53,7 +157,11 @@ class Post(PublishedModel, CreatedModel):
         )
     )
     author = models.ForeignKey(
-        User, on_delete=models.CASCADE, verbose_name='Автор публикации')
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Автор публикации',
+    )
     location = models.ForeignKey(
         Location,
         on_delete=models.SET_NULL,
@@ -67,30 +175,182 @@ class Post(PublishedModel, CreatedModel):
         null=True,
         verbose_name='Категория',
     )
-    image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    image = models.ImageField(
+        'Фото', upload_to='post_images', blank=True,
+        storage=post_image_storage,
+    )
+    image_width = models.PositiveIntegerField(
+        'Ширина фото', null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(
+        'Высота фото', null=True, blank=True, editable=False)
+    image_size = models.PositiveIntegerField(
+        'Размер фото, байт', null=True, blank=True, editable=False)
+    image_hash = models.CharField(
+        'SHA-256 фото', max_length=64, blank=True, editable=False)
+    image_variants = models.JSONField(
+        'Варианты фото', default=dict, blank=True, editable=False)
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+
+    excerpt = models.TextField(
+        editable=False, blank=True, verbose_name='Анонс')
+    reading_time = models.PositiveSmallIntegerField(
+        default=1, editable=False, verbose_name='Время чтения, мин')
+    text_html = models.TextField(
+        editable=False, blank=True, verbose_name='Текст в HTML')
+    text_html_version = models.PositiveSmallIntegerField(
+        default=0, editable=False, verbose_name='Версия рендеринга текста')
+
+    objects = PublishedPostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', )
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'),
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_feed_idx',
+            ),
+            # Ссылки на общий файл картинки, см. release_image
+            models.Index(fields=('image',), name='post_image_idx'),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        if 'image' in field_names:
+            post._loaded_image = values[field_names.index('image')]
+        return post
 
     def get_absolute_url(self):
         return reverse("blog:post_detail", args=(self.pk,))
 
+    def update_excerpt(self):
+        self.excerpt = get_excerpt(self.text)
+        self.reading_time = get_reading_time(self.text)
+
+    def update_text_html(self):
+        self.text_html = render_text_html(self.text)
+        self.text_html_version = TEXT_HTML_VERSION
+
+    def update_image_metadata(self):
+        """Размеры, объём и хэш картинки считаются при её загрузке."""
+        if not self.image:
+            self.image_width = self.image_height = self.image_size = None
+            self.image_hash = ''
+        elif not self.image._committed:
+            for field, value in get_image_metadata(self.image).items():
+                setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.update_excerpt()
+        self.update_text_html()
+        self.update_image_metadata()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            update_fields = {
+                *update_fields, 'excerpt', 'reading_time',
+                'text_html', 'text_html_version',
+            }
+        if update_fields is not None and 'image' in update_fields:
+            update_fields = {
+                *update_fields, 'image_width', 'image_height',
+                'image_size', 'image_hash',
+            }
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        uploaded = None
+        if self.image and not self.image._committed:
+            uploaded = self.image.file
+        super().save(*args, **kwargs)
+        if uploaded is not None:
+            # Файл с тем же содержимым мог быть удалён до коммита поста
+            name = self.image.name
+            transaction.on_commit(
+                lambda: self.image.storage.restore(name, uploaded))
+        replaced_image = getattr(self, '_loaded_image', None)
+        self._loaded_image = self.image.name
+        if replaced_image and replaced_image != self.image.name:
+            transaction.on_commit(lambda: release_image(replaced_image))
+
+    @property
+    def card_cache_version(self):
+        """Меняется при изменении поста, его автора, категории или места."""
+        category, location = self.category, self.location
+        return get_cache_version(
+            self.title, self.excerpt, self.reading_time, self.pub_date,
+            self.is_published, self.image, self.image_variants,
+            self.image_width, self.image_height, self.comment_count,
+            self.author.username,
+            category and (category.slug, category.title,
+                          category.is_published),
+            location and (location.name, location.is_published),
+        )
+
+    def get_responsive_image(self, display_width):
+        """Готовые варианты картинки или None, пока их нет."""
+        variants = self.image_variants
+        if not self.image or variants.get('name') != self.image.name:
+            return None
+        return ResponsiveImage(self.image, variants['sizes'], display_width)
+
+    @property
+    def card_image(self):
+        return self.get_responsive_image(settings.POST_IMAGE_CARD_WIDTH)
+
+    @property
+    def detail_image(self):
+        return self.get_responsive_image(settings.POST_IMAGE_DETAIL_WIDTH)
+
     def __str__(self):
         return self.title[:settings.TITLE_LENGTH]
 
 
+class PostSearchIndex(models.Model):
+    """
+    Полнотекстовый индекс постов FTS5 (только SQLite), см. blog.search.
+    Через связь search_index поиск присоединяет индекс к постам JOIN-ом.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_index',
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'blog_post_fts'
+
+
 class Comment(models.Model):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Комментируемый пост',
         related_name='comments'
     )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Автор комментария',
         related_name='comments',
     )
@@ -107,6 +367,32 @@ class Comment(models.Model):
         ordering = ['created_at']  # Сортировка
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+            # Списки и фильтры комментариев в админке
+            models.Index(
+                fields=('author', 'created_at'),
+                name='comment_author_created_idx',
+            ),
+            models.Index(
+                fields=('created_at',),
+                name='comment_created_idx',
+            ),
+            models.Index(
+                fields=('created_at',),
+                condition=models.Q(is_published=False),
+                name='comment_unpublished_idx',
+            ),
+        )
 
     def __str__(self):
         return f'Комментарий {self.author.username} к посту {self.post.title}'
+
+    @property
+    def cache_version(self):
+        """Меняется при изменении комментария или имени его автора."""
+        return get_cache_version(
+            self.text, self.created_at, self.author.username)
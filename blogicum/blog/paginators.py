@@ -0,0 +1,125 @@
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorPage:
+    """
+    Страница курсорной пагинации.
+    Повторяет интерфейс django.core.paginator.Page, который
+    использует шаблон includes/paginator.html.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Пагинатор по ключу (key_field, id).
+    Каждая страница выбирается диапазоном по индексу без OFFSET
+    и без COUNT(*), поэтому глубина страницы не влияет на скорость.
+    """
+
+    key_field = 'pub_date'
+    descending = True
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def encode_cursor(self, direction, obj):
+        value = getattr(obj, self.key_field).isoformat()
+        return urlsafe_base64_encode(
+            force_bytes(f'{direction}|{value}|{obj.pk}'))
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            direction, value, pk = force_str(
+                urlsafe_base64_decode(cursor)).split('|')
+            if direction not in (NEXT, PREVIOUS):
+                raise ValueError(direction)
+            return direction, datetime.fromisoformat(value), int(pk)
+        except (TypeError, ValueError):
+            raise Http404('Некорректный курсор страницы.')
+
+    def get_ordering(self, forward):
+        prefix = '-' if self.descending == forward else ''
+        return f'{prefix}{self.key_field}', f'{prefix}id'
+
+    def get_cursor_filter(self, value, pk, forward):
+        lookup = 'lt' if self.descending == forward else 'gt'
+        # Избыточная граница key_field <= value (>= value) позволяет
+        # начать чтение индекса с курсора: по одному OR планировщик
+        # диапазон не строит.
+        return Q(**{f'{self.key_field}__{lookup}e': value}) & (
+            Q(**{f'{self.key_field}__{lookup}': value})
+            | Q(**{self.key_field: value, f'id__{lookup}': pk})
+        )
+
+    def page(self, cursor=None):
+        queryset = self.queryset
+        forward = True
+        if cursor:
+            direction, value, pk = self.decode_cursor(cursor)
+            forward = direction == NEXT
+            count = len(queryset.query.where.children)
+            queryset = queryset.filter(
+                self.get_cursor_filter(value, pk, forward))
+            # Условия курсора ставятся в WHERE первыми: из двух границ
+            # по одному столбцу (курсор и pub_date <= now в published())
+            # SQLite начинает поиск по индексу с первой.
+            conditions = queryset.query.where.children
+            conditions[:] = conditions[count:] + conditions[:count]
+        items = list(
+            queryset.order_by(*self.get_ordering(forward))[:self.per_page + 1]
+        )
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if forward:
+            has_next, has_previous = has_more, bool(cursor)
+        else:
+            items.reverse()
+            has_next, has_previous = True, has_more
+        next_cursor = previous_cursor = None
+        if items and has_next:
+            next_cursor = self.encode_cursor(NEXT, items[-1])
+        if items and has_previous:
+            previous_cursor = self.encode_cursor(PREVIOUS, items[0])
+        return CursorPage(items, next_cursor, previous_cursor)
+
+
+class CommentCursorPaginator(CursorPaginator):
+    """Комментарии к посту по (created_at, id), от старых к новым."""
+
+    key_field = 'created_at'
+    descending = False
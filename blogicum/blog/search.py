@@ -0,0 +1,72 @@
+"""
+SQL полнотекстового индекса постов FTS5 (только SQLite): таблица
+blog_post_fts и триггеры, которые держат её в соответствии с blog_post.
+Общий для миграции 0008 и blog.signals.restore_search_triggers.
+"""
+
+# Индекс без копии текста (contentless); «ё» приводится к «е»,
+# потому что remove_diacritics не затрагивает кириллицу.
+TABLE_SQL = """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, text,
+        content='',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+TRIGGER_NAMES = (
+    'blog_post_fts_insert', 'blog_post_fts_delete', 'blog_post_fts_update',
+)
+
+# SQLite теряет триггеры, когда миграция пересоздаёт таблицу blog_post;
+# их восстанавливает blog.signals.restore_search_triggers.
+TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts(rowid, title, text) VALUES (
+            new.id,
+            replace(replace(new.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) VALUES (
+            'delete', old.id,
+            replace(replace(old.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) VALUES (
+            'delete', old.id,
+            replace(replace(old.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+        INSERT INTO blog_post_fts(rowid, title, text) VALUES (
+            new.id,
+            replace(replace(new.title, 'ё', 'е'), 'Ё', 'Е'),
+            replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')
+        );
+    END
+    """,
+)
+
+FILL_SQL = """
+    INSERT INTO blog_post_fts(rowid, title, text)
+    SELECT id,
+           replace(replace(title, 'ё', 'е'), 'Ё', 'Е'),
+           replace(replace(text, 'ё', 'е'), 'Ё', 'Е')
+    FROM blog_post
+"""
+
+CREATE_SQL = (TABLE_SQL, *TRIGGERS_SQL, FILL_SQL)
+
+DROP_TRIGGERS_SQL = tuple(
+    f'DROP TRIGGER IF EXISTS {name}' for name in TRIGGER_NAMES)
+
+DROP_SQL = (*DROP_TRIGGERS_SQL, 'DROP TABLE IF EXISTS blog_post_fts')
@@ -0,0 +1,76 @@
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import search
+from .images import schedule_variants
+from .models import Category, Comment, Location, Post
+from .storage import release_image
+from .utils import defer_changes, invalidate_page_cache, update_comment_count
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def refresh_post_comment_count(sender, instance, **kwargs):
+    """
+    Обновляет Post.comment_count при добавлении, удалении
+    и смене флага публикации комментария.
+    """
+    if not defer_changes([instance.post_id]):
+        update_comment_count([instance.post_id])
+
+
+@receiver(post_save, sender=Post)
+def make_image_variants(sender, instance, **kwargs):
+    """Заказывает варианты новой картинки поста."""
+    if instance.image and (
+        instance.image_variants.get('name') != instance.image.name
+    ):
+        schedule_variants(instance)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    """Удаляет файл картинки, если это была последняя ссылка на него."""
+    name = instance.image.name
+    if name:
+        transaction.on_commit(lambda: release_image(name))
+
+
+def invalidate_cached_pages(sender, **kwargs):
+    """Сбрасывает кэш страниц при изменении отображаемых на них данных."""
+    if not defer_changes():
+        invalidate_page_cache()
+
+
+for model in (Post, Comment, Category, Location):
+    post_save.connect(invalidate_cached_pages, sender=model)
+    post_delete.connect(invalidate_cached_pages, sender=model)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    """
+    Восстанавливает триггеры полнотекстового индекса постов, если
+    миграция пересоздала таблицу blog_post, и перестраивает индекс.
+    """
+    connection = connections[using]
+    if sender.name != 'blog' or connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        if 'blog_post_fts' not in connection.introspection.table_names(
+                cursor):
+            return
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'trigger' AND tbl_name = 'blog_post'"
+        )
+        if set(search.TRIGGER_NAMES) <= {name for name, in cursor}:
+            return
+        for statement in search.DROP_TRIGGERS_SQL:
+            cursor.execute(statement)
+        for statement in search.TRIGGERS_SQL:
+            cursor.execute(statement)
+        cursor.execute(
+            "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('delete-all')")
+        cursor.execute(search.FILL_SQL)
@@ -0,0 +1,84 @@
+import os
+import posixpath
+from contextlib import contextmanager
+
+from django.core.files import locks
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+
+from .images import (
+    VARIANT_FORMATS, get_file_hash, get_variant_name, get_variant_widths,
+)
+
+
+# Файл блокировки в корне хранилища, общий для всех процессов.
+LOCK_NAME = '.lock'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище, которое называет файл по SHA-256 содержимого:
+    одинаковые загрузки хранятся одним файлом, а ссылками на него
+    считаются посты с тем же именем картинки.
+    """
+
+    @contextmanager
+    def lock(self):
+        """Межпроцессная блокировка записи и удаления файлов."""
+        os.makedirs(self.location, exist_ok=True)
+        with open(os.path.join(self.location, LOCK_NAME), 'wb') as file:
+            locks.lock(file, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(file)
+
+    def get_content_name(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        digest = get_file_hash(content)
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.get_content_name(name, content)
+        with self.lock():
+            if self.exists(name):
+                return name
+            return super().save(name, content, max_length)
+
+    def restore(self, name, content):
+        """
+        Записывает файл заново, если release_image удалил его, пока
+        ссылающийся на него пост ещё не был закоммичен.
+        """
+        with self.lock():
+            if not self.exists(name):
+                content.seek(0)
+                self._save(name, content)
+
+
+post_image_storage = ContentAddressedStorage()
+
+
+def release_image(name):
+    """
+    Удаляет файл картинки и её варианты, когда на него
+    больше не ссылается ни один пост.
+    """
+    from blog.models import Post
+
+    if not name:
+        return
+    storage = Post._meta.get_field('image').storage
+    # Проверка ссылок и удаление не перемежаются с записью того же файла
+    with storage.lock():
+        if Post.objects.filter(image=name).exists():
+            return
+        storage.delete(name)
+        for width in get_variant_widths():
+            for extension in VARIANT_FORMATS:
+                storage.delete(get_variant_name(name, width, extension))
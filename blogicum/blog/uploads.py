@@ -0,0 +1,35 @@
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class OversizedUpload(UploadedFile):
+    """Файл, загрузка которого прервана из-за размера; содержимого нет."""
+
+    def __init__(self, name, content_type, size):
+        super().__init__(BytesIO(), name, content_type, size)
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """
+    Перестаёт принимать файл, как только он превысил
+    POST_IMAGE_MAX_SIZE: остаток потока читается, но не сохраняется
+    ни в память, ни во временный файл. Стоит первым в
+    FILE_UPLOAD_HANDLERS, чтобы отсекать данные до других обработчиков.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.oversized = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.POST_IMAGE_MAX_SIZE:
+            self.oversized = True
+        return None if self.oversized else raw_data
+
+    def file_complete(self, file_size):
+        if not self.oversized:
+            return None
+        return OversizedUpload(self.file_name, self.content_type, file_size)
@@ -6,8 +6,11 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.BlogListView.as_view(), name='index'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path('posts/<int:post_id>/',
          views.PostDetailView.as_view(), name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         views.PostCommentsView.as_view(), name='post_comments'),
     path('posts/<int:post_id>/edit/',
          views.PostEditUpdateView.as_view(), name='edit_post'),
     path('posts/<int:post_id>/delete/',
@@ -1,20 +1,110 @@
+import hashlib
+from math import ceil
+from contextlib import contextmanager
+from threading import local
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from blog.models import Post
+from blog.models import Comment, Post
+
+
+def update_comment_count(post_ids):
+    """
+    Пересчитывает счётчик опубликованных комментариев у постов
+    одним UPDATE с подзапросом и отмечает посты изменёнными.
+    Возвращает число обновлённых постов.
+    """
+    published_comments = Comment.objects.filter(
+        post=OuterRef('pk'), is_published=True
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return Post.objects.filter(pk__in=post_ids).update(
+        comment_count=Coalesce(Subquery(published_comments), 0),
+        updated_at=timezone.now(),
+    )
+
+
+PAGE_CACHE_VERSION_KEY = 'blog:page_cache_version_at'
+
+
+def get_page_cache_version():
+    """
+    Версия кэша страниц и время её назначения. Версия меняется при
+    любом изменении постов, комментариев, категорий и мест.
+    """
+    version = cache.get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        version = invalidate_page_cache()
+    return version
+
 
+def get_page_cache_key(request):
+    """
+    Ключ кэша страницы для анонимного пользователя:
+    путь, номер страницы (или курсор) и текущая версия кэша.
+    """
+    version, _ = get_page_cache_version()
+    page = request.GET.get('page', '')
+    cursor = request.GET.get('cursor', '')
+    url = hashlib.md5(
+        f'{request.path}?page={page}&cursor={cursor}'.encode()
+    ).hexdigest()
+    return f'blog:page:{version}:{url}'
+
+
+def invalidate_page_cache():
+    """
+    Сбрасывает кэш страниц, назначая ему новую версию. Версия живёт
+    до даты ближайшего отложенного поста: его появление в лентах
+    тоже меняет страницы, хотя сигналов при этом нет.
+    """
+    now = timezone.now()
+    version = uuid4().hex, now
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=now,
+    ).aggregate(next=Min('pub_date'))['next']
+    timeout = None
+    if next_pub_date is not None:
+        timeout = max(ceil((next_pub_date - now).total_seconds()), 1)
+    cache.set(PAGE_CACHE_VERSION_KEY, version, timeout)
+    return version
 
-def get_filter_posts(category=None):
+
+_bulk = local()
+
+
+@contextmanager
+def bulk_changes():
     """
-    Возвращает отфильтрованный список постов.
-    Если указана категория, фильтрует по категории.
+    Пакетное изменение данных: сигналы отдельных записей только
+    копят id постов, а счётчики комментариев и кэш страниц
+    обновляются один раз при выходе из блока.
     """
-    current_time = timezone.now()
-    filters = {
-        'is_published': True,
-        'pub_date__lte': current_time,
-        'category__is_published': True,
-    }
-    if category:
-        filters['category'] = category
+    if hasattr(_bulk, 'post_ids'):
+        yield
+        return
+    _bulk.post_ids, _bulk.changed = set(), False
+    try:
+        yield
+    finally:
+        post_ids, changed = _bulk.post_ids, _bulk.changed
+        del _bulk.post_ids, _bulk.changed
+        if post_ids:
+            update_comment_count(post_ids)
+        if changed:
+            invalidate_page_cache()
 
-    return Post.objects.filter(**filters)
+
+def defer_changes(post_ids=()):
+    """
+    Откладывает обновления до конца bulk_changes.
+    Возвращает False, если блок не открыт и обновлять нужно сразу.
+    """
+    if not hasattr(_bulk, 'post_ids'):
+        return False
+    _bulk.post_ids.update(post_ids)
+    _bulk.changed = True
+    return True
@@ -1,34 +1,60 @@
-from django.http import Http404
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth import get_user_model
 from django.urls import reverse_lazy, reverse
 from django.shortcuts import get_object_or_404, redirect
-from django.db.models import Count
-from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views.generic import (
-    ListView, DetailView, CreateView, DeleteView, UpdateView
+    ListView, DetailView, CreateView, DeleteView, TemplateView, UpdateView
 )
 
 from .models import Post, Comment, Category
 from .forms import AddPostForm, CommentForm
-from .mixins import CommentMixin, SuccessUrlMixin, GetObjectMixin
+from .mixins import (
+    AnonymousPageCacheMixin, CommentMixin, ConditionalGetMixin,
+    CursorPaginationMixin, GetObjectMixin, PostVisibilityMixin,
+    SuccessUrlMixin, TemplateEngineMixin,
+)
+from .paginators import CommentCursorPaginator
+from .utils import bulk_changes
 
 User = get_user_model()
 
 
-class BlogListView(ListView):
+class BlogListView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CursorPaginationMixin,
+    TemplateEngineMixin, ListView,
+):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = 10
 
     def get_queryset(self):
-        now = timezone.now()
-        return Post.objects.filter(
-            pub_date__lte=now, is_published=True, category__is_published=True
-        ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+        posts = Post.objects.published().for_card().with_comment_count()
+        return posts.order_by('-pub_date')
+
+
+class PostSearchView(TemplateEngineMixin, ListView):
+    template_name = 'blog/search.html'
+    paginate_by = 10
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return Post.objects.published().search(
+            self.query).for_card().with_comment_count()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['pagination_query'] = urlencode({'q': self.query}) + '&'
+        return context
 
 
-class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class PostDeleteView(
+    LoginRequiredMixin, UserPassesTestMixin, TemplateEngineMixin, DeleteView,
+):
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
@@ -38,66 +64,110 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return (self.request.user == post.author
                 or self.request.user.is_superuser)
 
+    def delete(self, request, *args, **kwargs):
+        # Каскад шлёт post_delete на каждый комментарий: счётчик
+        # и кэш страниц обновляются один раз на всё удаление
+        with bulk_changes():
+            return super().delete(request, *args, **kwargs)
+
     def get_success_url(self):
         return reverse('blog:index')
 
 
-class PostDetailView(DetailView):
+class PostDetailView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, PostVisibilityMixin,
+    TemplateEngineMixin, DetailView,
+):
     model = Post
     context_object_name = 'post'
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_conditional_aggregate(self):
+        # Изменение комментариев обновляет Post.updated_at через сигналы.
+        post = self.get_object()
+        return {
+            'count': post.comment_count, 'last_modified': post.updated_at
+        }
+
+    def get_queryset(self):
+        # Текст выводится из заранее отрендеренного text_html
+        return Post.objects.select_related(
+            'author', 'category', 'location'
+        ).defer('text')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
         context['form'] = CommentForm()
-        # Добавляем список комментариев к посту
-        context['comments'] = Comment.objects.filter(
-            post=post).order_by('created_at')
+        # Первая страница комментариев, следующие отдаёт PostCommentsView
+        context['comments'] = CommentCursorPaginator(
+            Comment.objects.filter(
+                post=self.object, is_published=True,
+            ).select_related('author'),
+            settings.COMMENTS_PER_PAGE,
+        ).page()
         return context
 
-    def get_object(self):
-        post = super().get_object()
-        # Проверка публикации поста
-        if not post.is_published and self.request.user != post.author:
-            raise Http404("Доступ запрещен. Пост снят с публикации.")
-        # Проверка, отложена публикация
-        if post.pub_date > timezone.now() and self.request.user != post.author:
-            raise Http404("Доступ запрещен. Публикация отложена.")
-        # Проверка публикации категории
-        if not post.category.is_published and self.request.user != post.author:
-            raise Http404("Доступ запрещен. Категория снята с публикации.")
-        return post
-
-
-class CategoryListView(ListView):
+    def get_object(self, queryset=None):
+        # Пост загружается один раз и для валидаторов, и для шаблона
+        if getattr(self, 'object', None) is None:
+            post = super().get_object(queryset)
+            self.check_visibility(post)
+            self.object = post
+        return self.object
+
+
+class PostCommentsView(
+    AnonymousPageCacheMixin, PostVisibilityMixin, TemplateEngineMixin,
+    TemplateView,
+):
+    """Фрагмент HTML со следующей страницей комментариев к посту."""
+
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        post = get_object_or_404(
+            Post.objects.select_related('category'), pk=self.kwargs['post_id'])
+        self.check_visibility(post)
+        context['post'] = post
+        context['comments'] = CommentCursorPaginator(
+            Comment.objects.filter(
+                post=post, is_published=True,
+            ).select_related('author'),
+            settings.COMMENTS_PER_PAGE,
+        ).page(self.request.GET.get('cursor'))
+        return context
+
+
+class CategoryListView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CursorPaginationMixin,
+    TemplateEngineMixin, ListView,
+):
     template_name = 'blog/category.html'
     context_object_name = 'posts'
     paginate_by = 10
 
-    def get_queryset(self):
-        category = get_object_or_404(Category.objects.filter(
+    @cached_property
+    def category(self):
+        return get_object_or_404(Category.objects.filter(
             is_published=True
         ), slug=self.kwargs['category_slug'])
 
+    def get_queryset(self):
         # Возвращаем только опубликованные посты
-        return Post.objects.filter(
-            category=category,
-            is_published=True,
-            pub_date__lte=timezone.now()
-        ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+        return Post.objects.published().filter(
+            category=self.category
+        ).for_card().with_comment_count().order_by('-pub_date')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Добавляем категорию в контекст
-        context['category'] = get_object_or_404(
-            Category, slug=self.kwargs['category_slug']
-        )
+        context['category'] = self.category
         return context
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, TemplateEngineMixin, CreateView):
     model = Post
     form_class = AddPostForm
     template_name = 'blog/create.html'
@@ -113,26 +183,30 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class UserProfileView(ListView):
+class UserProfileView(
+    ConditionalGetMixin, CursorPaginationMixin, TemplateEngineMixin, ListView,
+):
     model = User
     template_name = 'blog/profile.html'
     context_object_name = 'profile'
     paginate_by = 10
 
+    @cached_property
+    def author(self):
+        return get_object_or_404(User, username=self.kwargs['username'])
+
     def get_queryset(self):
-        user = get_object_or_404(User, username=self.kwargs['username'])
         return Post.objects.filter(
-            author=user
-        ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+            author=self.author
+        ).for_card().with_comment_count().order_by('-pub_date')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = get_object_or_404(User, username=self.kwargs['username'])
-        context['profile'] = user
+        context['profile'] = self.author
         return context
 
 
-class ProfileUpdateView(LoginRequiredMixin, UpdateView):
+class ProfileUpdateView(LoginRequiredMixin, TemplateEngineMixin, UpdateView):
     model = User
     template_name = 'blog/user.html'
     fields = ['first_name', 'last_name', 'username', 'email']
@@ -145,7 +219,9 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
             'blog:profile', kwargs={'username': self.request.user.username})
 
 
-class PostEditUpdateView(LoginRequiredMixin, UpdateView):
+class PostEditUpdateView(
+    LoginRequiredMixin, TemplateEngineMixin, UpdateView,
+):
     model = Post
     form_class = AddPostForm
     template_name = 'blog/create.html'
@@ -0,0 +1,94 @@
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.template import defaultfilters
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+from django.utils.timezone import template_localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import (
+    bootstrap_button, bootstrap_form,
+)
+from jinja2 import ChainableUndefined, Environment, nodes
+from jinja2.ext import Extension
+
+
+def render_value(value):
+    """
+    Выводит значение {{ }} так же, как шаблоны Django: даты в местном
+    времени и формате, экранирование django.utils.html.escape.
+    """
+    return mark_safe(conditional_escape(
+        localize(template_localtime(value))))
+
+
+def url(viewname, *args):
+    return reverse(viewname, args=args)
+
+
+def date(value, arg=None):
+    # Пустые и отсутствующие значения фильтр date Django выводит пустыми
+    if not value:
+        return ''
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+def get_fragment_cache():
+    try:
+        return caches['template_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+class FragmentCacheExtension(Extension):
+    """
+    {% cache 3600, 'имя', *vary_on %}...{% endcache %} — кэш фрагмента
+    с теми же ключами, что у тега cache шаблонов Django.
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('render_fragment', [nodes.List(args)]),
+            [], [], body,
+        ).set_lineno(lineno)
+
+    def render_fragment(self, args, caller):
+        timeout, fragment_name, *vary_on = args
+        fragment_cache = get_fragment_cache()
+        key = make_template_fragment_key(fragment_name, vary_on)
+        value = fragment_cache.get(key)
+        if value is None:
+            value = caller()
+            fragment_cache.set(key, value, timeout)
+        return value
+
+
+def environment(**options):
+    """Окружение Jinja2 для шаблонов блога, см. TEMPLATES в settings."""
+    # Как в шаблонах Django, отсутствующие переменные выводятся пустыми
+    options['undefined'] = ChainableUndefined
+    env = Environment(
+        extensions=[FragmentCacheExtension],
+        finalize=render_value,
+        keep_trailing_newline=True,
+        **options,
+    )
+    env.globals.update({
+        'static': static,
+        'url': url,
+        'bootstrap_form': bootstrap_form,
+        'bootstrap_button': bootstrap_button,
+    })
+    env.filters.update({
+        'date': date,
+        'linebreaksbr': defaultfilters.linebreaksbr,
+    })
+    return env
@@ -0,0 +1,88 @@
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .staticfiles import (
+    accepts_encoding, brotli, compress_brotli, compress_gzip,
+)
+
+# Типы ответов, которые сжимаются; картинки и архивы уже сжаты.
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+)
+
+# Содержимое этих тегов выводится как есть, пробелы в нём значимы.
+PRESERVED_BLOCKS_RE = re.compile(
+    r'(<(pre|textarea)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+INDENT_RE = re.compile(r'[ \t\r\f\v]*\n\s*')
+
+
+def minify_html(html):
+    """
+    Убирает отступы и пустые строки шаблонов: каждая цепочка пробелов
+    с переводом строки сворачивается в один перевод строки, что
+    для браузера равнозначно. <pre> и <textarea> не изменяются.
+    """
+    parts = PRESERVED_BLOCKS_RE.split(html)
+    # split возвращает: текст, блок, имя тега, текст, блок, имя тега, ...
+    return ''.join(
+        INDENT_RE.sub('\n', part) if index % 3 == 0 else part
+        for index, part in enumerate(parts)
+        if index % 3 != 2
+    ).strip()
+
+
+def get_compressors():
+    """Доступные кодировки по убыванию предпочтения с уровнями сжатия."""
+    levels = settings.RESPONSE_COMPRESSION_LEVELS
+    compressors = [('gzip', compress_gzip, levels['gzip'])]
+    if brotli is not None:
+        compressors.insert(0, ('br', compress_brotli, levels['br']))
+    return compressors
+
+
+class CompressionMiddleware:
+    """
+    Минифицирует HTML (HTML_MINIFY) и сжимает ответ в brotli или gzip
+    по Accept-Encoding. Потоковые, уже сжатые и короткие ответы,
+    а также медиафайлы не трогает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        if settings.HTML_MINIFY and content_type.startswith('text/html'):
+            charset = response.charset
+            response.content = minify_html(
+                response.content.decode(charset)).encode(charset)
+            response['Content-Length'] = str(len(response.content))
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_LENGTH:
+            return response
+        for encoding, compress, level in get_compressors():
+            if accepts_encoding(request, encoding):
+                break
+        else:
+            return response
+        compressed = compress(response.content, level)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # Сжатое тело уже не побайтно равно исходному
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
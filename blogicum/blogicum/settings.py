@@ -48,8 +48,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -63,6 +65,8 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+JINJA2_TEMPLATES_DIR = BASE_DIR / 'templates_jinja2'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -77,8 +81,28 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        # Шаблоны blog/ и includes/ для Jinja2, см. BLOG_TEMPLATE_ENGINE.
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [JINJA2_TEMPLATES_DIR],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'blogicum.jinja2.environment',
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
 ]
 
+# Движок шаблонов страниц блога: 'django' или 'jinja2'.
+BLOG_TEMPLATE_ENGINE = 'django'
+
+# Разбирать все шаблоны при старте воркера, см. blogicum.templating.
+TEMPLATES_PRECOMPILE = False
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
@@ -93,6 +117,25 @@ DATABASES = {
 }
 
 
+# Сигналы сбрасывают кэш страниц и фрагментов, меняя ключи в кэше,
+# поэтому с несколькими процессами кэш должен быть общим для всех
+# (см. settings_production): LocMemCache у каждого процесса свой.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+    }
+}
+
+# Время жизни кэша страниц для анонимных пользователей, в секундах.
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Сжатие ответов, см. blogicum.middleware.CompressionMiddleware.
+RESPONSE_COMPRESSION_LEVELS = {'br': 5, 'gzip': 6}
+RESPONSE_COMPRESSION_MIN_LENGTH = 512
+HTML_MINIFY = True
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -138,6 +181,9 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 INTERNAL_IPS = [
@@ -148,6 +194,36 @@ MAX_LENGTH_TITLE = 256
 
 TITLE_LENGTH = 10
 
+EXCERPT_WORDS = 10
+
+READING_WORDS_PER_MINUTE = 200
+
+# Курсорная пагинация лент по (pub_date, id) вместо LIMIT/OFFSET.
+FEED_CURSOR_PAGINATION = False
+
+# Комментариев на странице поста и во фрагменте «Показать ещё».
+COMMENTS_PER_PAGE = 50
+
+# Ширина картинки поста в карточке и на странице поста, px.
+POST_IMAGE_CARD_WIDTH = 640
+POST_IMAGE_DETAIL_WIDTH = 960
+
+# Процессов для нарезки вариантов картинок; 0 — нарезать в запросе.
+POST_IMAGE_WORKERS = 2
+
+# Ограничения картинки поста: размер файла и число пикселей.
+POST_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+POST_IMAGE_MAX_PIXELS = 40_000_000
+
+# Загрузки крупнее 256 КБ пишутся во временный файл, а не в память.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+
+FILE_UPLOAD_HANDLERS = [
+    'blog.uploads.MaxSizeUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -0,0 +1,68 @@
+"""
+Настройки для боевого окружения: DJANGO_SETTINGS_MODULE =
+blogicum.settings_production. Секретный ключ, хосты и адрес memcached
+берутся из переменных окружения DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS
+и DJANGO_MEMCACHED_LOCATION.
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host.strip()
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+
+# Кэш страниц и его версия общие для всех воркеров: сброс кэша
+# сигналом в одном процессе виден остальным.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_MEMCACHED_LOCATION', '127.0.0.1:11211'),
+    }
+}
+
+# Шаблоны разбираются один раз на процесс и хранятся в памяти;
+# при явных loaders APP_DIRS должен быть выключен.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'debug': False,
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+    *TEMPLATES[1:],
+]
+
+# Все шаблоны попадают в кэш загрузчика при старте воркера,
+# а ошибка в любом из них не даёт воркеру запуститься.
+TEMPLATES_PRECOMPILE = True
+
+# collectstatic добавляет хэш содержимого в имена и сжатые копии,
+# а blogicum.staticfiles.serve_static отдаёт их с бессрочным кэшем.
+STATICFILES_STORAGE = (
+    'blogicum.staticfiles.CompressedManifestStaticFilesStorage'
+)
@@ -0,0 +1,97 @@
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.static import serve
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - без brotli остаётся только gzip
+    brotli = None
+
+# Текстовые форматы, которые имеет смысл сжимать заранее.
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.txt', '.json', '.xml', '.ico',
+)
+
+# Имя файла с хэшем содержимого, которое выдаёт ManifestStaticFilesStorage.
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+
+# Кэшировать файлы с хэшем в имени можно навсегда: новая версия
+# файла получит новое имя.
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MUTABLE_MAX_AGE = 60 * 60
+
+
+def accepts_encoding(request, encoding):
+    """Принимает ли клиент ответ в кодировке encoding (br, gzip)."""
+    return bool(re.search(
+        rf'\b{encoding}\b', request.META.get('HTTP_ACCEPT_ENCODING', '')))
+
+
+def compress_gzip(content, level=9):
+    # mtime=0 делает архив воспроизводимым между сборками
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def compress_brotli(content, quality=11):
+    return brotli.compress(content, quality=quality)
+
+
+def get_precompressors():
+    """Пары (расширение, функция сжатия) для файлов рядом с оригиналом."""
+    compressors = [('.gz', compress_gzip)]
+    if brotli is not None:
+        compressors.insert(0, ('.br', compress_brotli))
+    return compressors
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Статика с хэшем содержимого в имени и заранее сжатыми копиями
+    .gz и .br рядом с каждым текстовым файлом.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.precompress(name)
+
+    def precompress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        for extension, compress in get_precompressors():
+            compressed = compress(content)
+            # Сжатая копия нужна, только если она действительно меньше
+            if len(compressed) < len(content):
+                with open(self.path(name + extension), 'wb') as file:
+                    file.write(compressed)
+
+
+def serve_static(request, path):
+    """
+    Отдаёт собранную статику из STATIC_ROOT: сжатую копию, если клиент
+    её принимает, и с бессрочным кэшированием для имён с хэшем.
+    """
+    document_root = settings.STATIC_ROOT
+    response = None
+    for extension, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+        if accepts_encoding(request, encoding) and os.path.isfile(
+                os.path.join(document_root, path + extension)):
+            response = serve(request, path + extension, document_root)
+            break
+    if response is None:
+        response = serve(request, path, document_root)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if HASHED_NAME_RE.search(path):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
@@ -0,0 +1,71 @@
+import os
+from functools import partial
+
+import jinja2
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.jinja2 import Jinja2
+
+
+def get_loader_dirs(engine):
+    """Каталоги шаблонов всех загрузчиков движка, включая вложенные."""
+    dirs = []
+    for loader in engine.template_loaders:
+        for inner in getattr(loader, 'loaders', [loader]):
+            for directory in inner.get_dirs():
+                if directory not in dirs:
+                    dirs.append(directory)
+    return dirs
+
+
+def iter_template_names(directory):
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if not filename.startswith('.'):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def iter_templates(backend):
+    """Пары (имя для отчёта, загрузка шаблона) всех шаблонов движка."""
+    if isinstance(backend, DjangoTemplates):
+        for directory in get_loader_dirs(backend.engine):
+            for name in iter_template_names(directory):
+                yield (os.path.join(directory, name),
+                       partial(backend.engine.get_template, name))
+    elif isinstance(backend, Jinja2):
+        for name in backend.env.list_templates():
+            yield name, partial(backend.env.get_template, name)
+
+
+def precompile_templates():
+    """
+    Разбирает все шаблоны движков Django и Jinja2, чтобы кэши
+    загрузчиков получили их до первого запроса. Ошибки синтаксиса
+    собираются и останавливают запуск. Возвращает число шаблонов.
+    """
+    compiled = 0
+    errors = []
+    for backend in engines.all():
+        for name, load in iter_templates(backend):
+            try:
+                load()
+            except (
+                TemplateSyntaxError, jinja2.TemplateSyntaxError,
+                UnicodeDecodeError,
+            ) as error:
+                errors.append(f'{name}: {error}')
+            else:
+                compiled += 1
+    if errors:
+        raise ImproperlyConfigured(
+            'Шаблоны с ошибками:\n' + '\n'.join(errors))
+    return compiled
+
+
+def precompile_templates_on_boot():
+    """Вызывается из wsgi.py и asgi.py при TEMPLATES_PRECOMPILE."""
+    if settings.TEMPLATES_PRECOMPILE:
+        precompile_templates()
@@ -3,7 +3,9 @@ from django.views.generic.edit import CreateView
 from django.conf.urls.static import static
 from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
+
+from .staticfiles import serve_static
 
 
 handler404 = 'pages.views.page_not_found_404'
@@ -30,3 +32,10 @@ if settings.DEBUG:
     import debug_toolbar
     # Добавить к списку urlpatterns список адресов из приложения debug_toolbar:
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
+else:
+    # Собранная collectstatic статика, см. blogicum.staticfiles
+    urlpatterns += (
+        re_path(
+            rf'^{settings.STATIC_URL.lstrip("/")}(?P<path>.*)$', serve_static
+        ),
+    )
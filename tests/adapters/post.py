@@ -33,6 +33,17 @@ class PostModelAdapter(StudentModelAdapter):
             "author",
             "category",
             "location",
+            "comment_count",
+            "updated_at",
+            "excerpt",
+            "reading_time",
+            "text_html",
+            "text_html_version",
+            "image_variants",
+            "image_width",
+            "image_height",
+            "image_size",
+            "image_hash",
             "refresh_from_db",
         ]
 
@@ -0,0 +1,27 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from mixer.backend.django import Mixer
+from PIL import Image
+
+
+def make_photo(width, height, color="teal"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "JPEG")
+    return ContentFile(buffer.getvalue(), name="photo.jpg")
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WORKERS = 0
+    return tmp_path
+
+
+@pytest.fixture
+def post_with_photo(mixer: Mixer, media_root, published_category):
+    return mixer.blend(
+        "blog.Post", category=published_category,
+        image=make_photo(1600, 1000),
+    )
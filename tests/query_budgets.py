@@ -0,0 +1,79 @@
+"""
+Бюджеты SQL-запросов на один GET-запрос к странице.
+Ключ — имя маршрута, значение — для каждой роли пара (максимум
+запросов, ожидаемый код ответа) на наборе данных фикстуры `seed`
+из test_query_budgets.py. Код проверяется, потому что 404 или ранний
+редирект укладываются в любой бюджет.
+При добавлении маршрута впишите его сюда; при оптимизации — уменьшите.
+"""
+
+QUERY_BUDGETS = {
+    'blog:index': {
+        'anonymous': (3, 200), 'author': (5, 200), 'other': (5, 200),
+    },
+    'blog:post_detail': {
+        'anonymous': (2, 200), 'author': (4, 200), 'other': (4, 200),
+    },
+    'blog:post_comments': {
+        'anonymous': (2, 200), 'author': (4, 200), 'other': (4, 200),
+    },
+    'blog:search': {
+        'anonymous': (2, 200), 'author': (4, 200), 'other': (4, 200),
+    },
+    'blog:edit_post': {
+        'anonymous': (2, 302), 'author': (7, 200), 'other': (4, 302),
+    },
+    'blog:delete_post': {
+        'anonymous': (0, 302), 'author': (5, 200), 'other': (4, 403),
+    },
+    'blog:create_post': {
+        'anonymous': (0, 302), 'author': (4, 200), 'other': (4, 200),
+    },
+    'blog:add_comment': {
+        'anonymous': (0, 302), 'author': (2, 200), 'other': (2, 200),
+    },
+    'blog:edit_comment': {
+        'anonymous': (0, 302), 'author': (4, 200), 'other': (4, 403),
+    },
+    'blog:delete_comment': {
+        'anonymous': (0, 302), 'author': (4, 200), 'other': (4, 403),
+    },
+    'blog:category_posts': {
+        'anonymous': (4, 200), 'author': (6, 200), 'other': (6, 200),
+    },
+    'blog:edit_profile': {
+        'anonymous': (0, 302), 'author': (2, 200), 'other': (2, 200),
+    },
+    'blog:profile': {
+        'anonymous': (4, 200), 'author': (6, 200), 'other': (6, 200),
+    },
+    'pages:about': {
+        'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200),
+    },
+    'pages:rules': {
+        'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200),
+    },
+    'login': {'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200)},
+    'logout': {'anonymous': (0, 200), 'author': (4, 200), 'other': (4, 200)},
+    'password_change': {
+        'anonymous': (0, 302), 'author': (2, 200), 'other': (2, 200),
+    },
+    'password_change_done': {
+        'anonymous': (0, 302), 'author': (2, 200), 'other': (2, 200),
+    },
+    'password_reset': {
+        'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200),
+    },
+    'password_reset_done': {
+        'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200),
+    },
+    'password_reset_confirm': {
+        'anonymous': (5, 302), 'author': (5, 302), 'other': (5, 302),
+    },
+    'password_reset_complete': {
+        'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200),
+    },
+    'registration': {
+        'anonymous': (0, 200), 'author': (2, 200), 'other': (2, 200),
+    },
+}
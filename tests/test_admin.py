@@ -0,0 +1,215 @@
+import pytest
+from django.contrib.admin import helpers
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import utils
+
+pytestmark = [pytest.mark.django_db]
+
+POST_CHANGELIST_URL = '/admin/blog/post/'
+
+
+def count_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return len(context.captured_queries), response.content.decode('utf-8')
+
+
+def test_post_changelist_queries_do_not_grow(
+        mixer, admin_client, user, published_category, published_location
+):
+    mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    few, _ = count_queries(admin_client, POST_CHANGELIST_URL)
+
+    locations = mixer.cycle(5).blend('blog.Location', name=mixer.sequence(
+        'Локация-{0}'))
+    mixer.cycle(10).blend(
+        'blog.Post', author=mixer.SELECT, category=published_category,
+        location=mixer.sequence(*locations),
+    )
+    many, content = count_queries(admin_client, POST_CHANGELIST_URL)
+
+    assert many == few, (
+        "Убедитесь, что число запросов списка постов в админке "
+        f"не зависит от числа строк: {few} запросов для 2 постов, "
+        f"{many} для 12."
+    )
+    assert content.count('Локация-') == len(locations) * 2, (
+        "Убедитесь, что редактируемые поля `location` и `category` "
+        "не выводят все варианты выбора в каждой строке."
+    )
+
+
+def test_post_changelist_search_uses_fulltext_index(
+        mixer, admin_client, user, published_category
+):
+    found = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Ёжики в тумане',
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Про котов',
+    )
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(POST_CHANGELIST_URL, {'q': 'ежик'})
+    assert list(response.context['cl'].result_list) == [found], (
+        "Убедитесь, что поиск в админке постов находит посты по началу слова."
+    )
+    if connection.vendor == 'sqlite':
+        assert any(
+            'blog_post_fts' in query['sql']
+            for query in context.captured_queries
+        ), "Убедитесь, что поиск в админке использует индекс FTS5."
+
+
+COMMENT_CHANGELIST_URL = '/admin/blog/comment/'
+
+
+def test_comment_changelist_queries_do_not_grow(
+        mixer, admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    few, _ = count_queries(admin_client, COMMENT_CHANGELIST_URL)
+
+    posts = mixer.cycle(3).blend('blog.Post', category=post.category)
+    mixer.cycle(10).blend(
+        'blog.Comment', post=mixer.sequence(*posts), author=mixer.SELECT,
+        text='Очень длинный комментарий ' * 50,
+    )
+    with CaptureQueriesContext(connection) as context:
+        many, content = count_queries(admin_client, COMMENT_CHANGELIST_URL)
+
+    assert many == few, (
+        "Убедитесь, что число запросов списка комментариев в админке "
+        f"не зависит от числа строк: {few} запросов для 2 комментариев, "
+        f"{many} для 12."
+    )
+    assert 'Очень длинный комментарий ' * 50 not in content, (
+        "Убедитесь, что список комментариев в админке выводит "
+        "сокращённый текст."
+    )
+    assert not any(
+        '"blog_post"."text"' in query['sql']
+        for query in context.captured_queries
+    ), (
+        "Убедитесь, что список комментариев в админке не загружает "
+        "тексты постов: выводятся только их заголовки."
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN of SQLite'
+)
+@pytest.mark.parametrize('params, index_name', (
+    ({}, 'comment_created_idx'),
+    ({'is_published__exact': '0'}, 'comment_unpublished_idx'),
+    ({'post__id__exact': '1'}, 'comment_post_created_idx'),
+    ({'author__id__exact': '1'}, 'comment_author_created_idx'),
+))
+def test_comment_changelist_filters_use_indexes(
+        admin_client, post_with_published_location, params, index_name
+):
+    response = admin_client.get(COMMENT_CHANGELIST_URL, params)
+    assert response.status_code == 200
+    plan = response.context['cl'].queryset.explain()
+    assert f'USING INDEX {index_name}' in plan, (
+        f"Убедитесь, что список комментариев с фильтром {params} "
+        f"использует индекс `{index_name}`:\n{plan}"
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f"Убедитесь, что сортировка выполняется по индексу:\n{plan}"
+    )
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Считает вызовы пересчёта счётчиков и сброса кэша страниц."""
+    counter = {'update_comment_count': 0, 'invalidate_page_cache': 0}
+    for name in counter:
+        original = getattr(utils, name)
+
+        def counted(*args, original=original, name=name):
+            counter[name] += 1
+            return original(*args)
+
+        monkeypatch.setattr(utils, name, counted)
+    return counter
+
+
+def run_action(client, url, action, objects, **data):
+    return client.post(url, {
+        'action': action,
+        helpers.ACTION_CHECKBOX_NAME: [obj.pk for obj in objects],
+        **data,
+    })
+
+
+def test_comment_actions_update_counters_once(
+        mixer, admin_client, published_category, calls
+):
+    posts = mixer.cycle(2).blend('blog.Post', category=published_category)
+    comments = mixer.cycle(6).blend(
+        'blog.Comment', post=mixer.sequence(*posts))
+    calls.update(update_comment_count=0, invalidate_page_cache=0)
+
+    response = run_action(
+        admin_client, COMMENT_CHANGELIST_URL, 'unpublish', comments[:5])
+
+    assert response.status_code == 302
+    assert [
+        type(post).objects.get(pk=post.pk).comment_count for post in posts
+    ] == [0, 1], (
+        "Убедитесь, что снятие комментариев с публикации в админке "
+        "обновляет `Post.comment_count`."
+    )
+    assert calls == {'update_comment_count': 1, 'invalidate_page_cache': 1}, (
+        "Убедитесь, что массовые действия с комментариями пересчитывают "
+        "счётчики и сбрасывают кэш страниц один раз на пакет, "
+        "а не для каждой записи."
+    )
+
+
+def test_post_actions_run_set_based(
+        mixer, admin_client, user, published_category, calls
+):
+    posts = mixer.cycle(4).blend(
+        'blog.Post', author=user, category=published_category)
+    mixer.cycle(4).blend('blog.Comment', post=mixer.sequence(*posts))
+    category = mixer.blend('blog.Category')
+    post_model = type(posts[0])
+    calls.update(update_comment_count=0, invalidate_page_cache=0)
+
+    with CaptureQueriesContext(connection) as context:
+        run_action(
+            admin_client, POST_CHANGELIST_URL, 'set_category', posts[:3],
+            category=category.pk,
+        )
+    updates = [
+        query for query in context.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        "Убедитесь, что перенос постов в категорию выполняется "
+        "одним UPDATE на пакет."
+    )
+    assert post_model.objects.filter(category=category).count() == 3
+
+    run_action(admin_client, POST_CHANGELIST_URL, 'unpublish', posts[:2])
+    assert post_model.objects.filter(is_published=False).count() == 2
+
+    run_action(
+        admin_client, POST_CHANGELIST_URL, 'delete_selected', posts[2:],
+        post='yes',
+    )
+    assert post_model.objects.count() == 2
+    assert calls == {'update_comment_count': 1, 'invalidate_page_cache': 3}, (
+        "Убедитесь, что массовые действия с постами сбрасывают кэш "
+        "страниц один раз на действие, а не для каждой записи."
+    )
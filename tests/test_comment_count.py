@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что `Post.comment_count` увеличивается "
+        "при добавлении комментария."
+    )
+
+    comments[0].is_published = False
+    comments[0].save()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что `Post.comment_count` учитывает только "
+        "опубликованные комментарии."
+    )
+
+    comments[1].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что `Post.comment_count` уменьшается "
+        "при удалении комментария."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    type(post).objects.update(comment_count=0)
+
+    call_command('recount_comments', chunk_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `recount_comments` восстанавливает "
+        "значение `Post.comment_count`."
+    )
+
+
+def test_feed_reads_comment_count_column(post_with_published_location):
+    queryset = type(post_with_published_location).objects.published()
+    sql = str(queryset.for_card().with_comment_count().query)
+    assert 'comment_count' in sql and 'blog_comment' not in sql, (
+        "Убедитесь, что ленты читают `Post.comment_count` без JOIN "
+        "с таблицей комментариев."
+    )
+
+
+def test_unpublished_comments_are_hidden(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    visible, hidden = mixer.cycle(2).blend(
+        'blog.Comment', post=post,
+        text=mixer.sequence('Видимый комментарий', 'Скрытый комментарий'),
+        is_published=mixer.sequence(True, False),
+    )
+    post.refresh_from_db()
+    for url in (f'/posts/{post.id}/', f'/posts/{post.id}/comments/'):
+        content = client.get(url).content.decode('utf-8')
+        assert visible.text in content
+        assert hidden.text not in content, (
+            "Убедитесь, что снятые с публикации комментарии не выводятся "
+            "на странице поста: счётчик их не учитывает."
+        )
+    feed = client.get('/').content.decode('utf-8')
+    assert f'Комментарии ({post.comment_count})' in feed
+    assert post.comment_count == 1
+
+
+def test_post_delete_queries_do_not_depend_on_comments(
+        mixer, user, user_client, published_category
+):
+    query_counts = []
+    for comments in (1, 50):
+        post = mixer.blend(
+            'blog.Post', author=user, category=published_category)
+        Comment.objects.bulk_create(
+            Comment(post=post, author=user, text='Комментарий')
+            for _ in range(comments)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(f'/posts/{post.id}/delete/')
+        assert response.status_code == HTTPStatus.FOUND
+        assert not Post.objects.filter(pk=post.pk).exists()
+        query_counts.append(len(queries))
+    assert query_counts[0] == query_counts[1], (
+        "Убедитесь, что удаление поста выполняет одинаковое число запросов "
+        "независимо от числа комментариев: счётчик и кэш страниц "
+        f"обновляются один раз ({query_counts[0]} и {query_counts[1]})."
+    )
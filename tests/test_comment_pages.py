@@ -0,0 +1,52 @@
+import re
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+MORE_RE = re.compile(r'href="([^"]+)" data-comments-more')
+
+
+def get_comment_ids(content):
+    return [int(pk) for pk in re.findall(r'name="comment_(\d+)"', content)]
+
+
+def test_comments_are_paginated(
+        mixer, settings, client, post_with_published_location
+):
+    settings.COMMENTS_PER_PAGE = 3
+    post = post_with_published_location
+    comments = mixer.cycle(7).blend('blog.Comment', post=post)
+    expected = [comment.id for comment in sorted(
+        comments, key=lambda comment: (comment.created_at, comment.id))]
+
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    seen = get_comment_ids(content)
+    assert seen == expected[:3], (
+        "Убедитесь, что на странице поста выводится первая страница "
+        "комментариев."
+    )
+    while MORE_RE.search(content):
+        url = MORE_RE.search(content).group(1).replace('&amp;', '&')
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        content = response.content.decode('utf-8')
+        seen += get_comment_ids(content)
+    assert seen == expected, (
+        "Убедитесь, что фрагменты комментариев продолжают список "
+        "без пропусков и повторов."
+    )
+
+
+def test_comments_fragment_hides_unpublished_post(
+        client, comment_to_a_post
+):
+    post = comment_to_a_post.post
+    post.is_published = False
+    post.save()
+    response = client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарии к скрытому посту недоступны "
+        "через фрагмент."
+    )
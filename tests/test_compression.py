@@ -0,0 +1,64 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from blogicum.middleware import CompressionMiddleware, minify_html
+from blogicum.staticfiles import brotli
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_html_is_minified_and_gzipped(client, post_with_published_location):
+    plain = client.get('/')
+    assert '\n    ' not in plain.content.decode('utf-8'), (
+        "Убедитесь, что из HTML-страниц убираются отступы шаблонов."
+    )
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+    assert response['Content-Encoding'] == 'gzip', (
+        "Убедитесь, что страницы сжимаются gzip, если клиент его принимает."
+    )
+    assert gzip.decompress(response.content) == plain.content
+    assert 'Accept-Encoding' in response['Vary']
+
+
+@pytest.mark.skipif(brotli is None, reason='brotli не установлен')
+def test_brotli_is_preferred(client, post_with_published_location):
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content) == client.get('/').content
+
+
+def test_minify_keeps_preformatted_text():
+    html = (
+        '<div>\n    <p>Текст</p>\n\n  </div>\n'
+        '<textarea name="text">\n  строка\n\n    отступ</textarea>\n'
+        '<pre>  код\n    блок</pre>'
+    )
+    assert minify_html(html) == (
+        '<div>\n<p>Текст</p>\n</div>\n'
+        '<textarea name="text">\n  строка\n\n    отступ</textarea>\n'
+        '<pre>  код\n    блок</pre>'
+    )
+
+
+@pytest.mark.parametrize('response', (
+    HttpResponse(b'\x89PNG' * 1000, content_type='image/png'),
+    StreamingHttpResponse(iter([b'a' * 1000]), content_type='text/plain'),
+    HttpResponse(b'a' * 10, content_type='text/plain'),
+), ids=('media', 'streaming', 'short'))
+def test_compression_skips_responses(response):
+    middleware = CompressionMiddleware(lambda request: response)
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert not middleware(request).has_header('Content-Encoding'), (
+        "Убедитесь, что медиафайлы, потоковые и короткие ответы "
+        "не сжимаются."
+    )
+
+
+def test_benchmark_compression_command(capsys, post_with_published_location):
+    call_command('benchmark_compression', '/', repeat=1)
+    output = capsys.readouterr().out
+    assert 'raw' in output and 'gzip-6' in output
@@ -0,0 +1,128 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_pages_answer_not_modified(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    ):
+        response = user_client.get(url)
+        assert response.has_header('ETag'), (
+            f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+        )
+        assert response.has_header('Last-Modified'), (
+            f"Убедитесь, что страница `{url}` отдаёт заголовок Last-Modified."
+        )
+        etag = response['ETag']
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что страница `{url}` отвечает 304 Not Modified, "
+            "если публикации не менялись."
+        )
+        post.title = f'Заголовок для {url}'
+        post.save()
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что страница `{url}` отдаётся заново "
+            "после изменения публикации."
+        )
+
+
+def test_comment_changes_post_validators(user_client, comment_to_a_post):
+    url = f'/posts/{comment_to_a_post.post_id}/'
+    etag = user_client.get(url)['ETag']
+    comment_to_a_post.text = 'Изменённый комментарий'
+    comment_to_a_post.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что изменение комментария меняет ETag страницы поста."
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Переводит часы вперёд: HTTP-даты меряются в целых секундах."""
+    start = timezone.now()
+    offset = [timedelta()]
+    monkeypatch.setattr(timezone, 'now', lambda: start + offset[0])
+
+    def advance(**kwargs):
+        offset[0] += timedelta(**kwargs)
+
+    return advance
+
+
+def assert_modified(response, url, reason):
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` отдаётся заново, {reason}."
+    )
+
+
+def test_related_changes_update_etag(
+        client, clock, post_with_published_location
+):
+    post = post_with_published_location
+    for url, related in (
+        ('/', post.category),
+        (f'/posts/{post.id}/', post.location),
+    ):
+        etag = client.get(url)['ETag']
+        clock(seconds=2)
+        related.title = related.name = 'Новое название'
+        related.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert_modified(
+            response, url, 'когда переименованы категория или место поста')
+
+
+def test_feed_last_modified_never_goes_back(
+        client, clock, mixer, user, published_category
+):
+    older, newest = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+        pub_date=mixer.sequence(
+            timezone.now() - timedelta(days=2),
+            timezone.now() - timedelta(days=1),
+        ),
+    )
+    last_modified = client.get('/')['Last-Modified']
+    clock(seconds=2)
+    newest.delete()
+    response = client.get('/', HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert_modified(response, '/', 'когда удалён самый новый пост')
+    assert newest.title not in response.content.decode('utf-8')
+    assert older.title in response.content.decode('utf-8')
+
+
+def test_scheduled_post_refreshes_feed(
+        client, mixer, user, published_category
+):
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    response = client.get('/')
+    etag, last_modified = response['ETag'], response['Last-Modified']
+    # Кэш страниц и даты HTTP живут по настоящим часам
+    time.sleep(2)
+    for header, value in (
+        ('HTTP_IF_NONE_MATCH', etag),
+        ('HTTP_IF_MODIFIED_SINCE', last_modified),
+    ):
+        response = client.get('/', **{header: value})
+        assert_modified(
+            response, '/', f'когда наступила дата поста «{scheduled.title}»')
+        assert scheduled.title in response.content.decode('utf-8')
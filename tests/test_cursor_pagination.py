@@ -0,0 +1,67 @@
+import re
+from http import HTTPStatus
+
+import pytest
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+CURSOR_RE = re.compile(r'href="\?cursor=([^"]+)">(Назад|Вперёд)<')
+
+
+def get_page(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` с курсорной пагинацией "
+        "отображается без ошибок."
+    )
+    links = {label: cursor for cursor, label in
+             CURSOR_RE.findall(response.content.decode('utf-8'))}
+    return list(response.context['page_obj']), links
+
+
+def test_cursor_pagination_walks_feed(
+        user_client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id), reverse=True,
+    )
+
+    first, links = get_page(user_client, '/?cursor=')
+    assert first == expected[:N_PER_PAGE], (
+        "Убедитесь, что первая страница курсорной пагинации содержит "
+        "самые новые публикации."
+    )
+    assert 'Назад' not in links and 'Вперёд' in links
+
+    second, links = get_page(user_client, f"/?cursor={links['Вперёд']}")
+    assert second == expected[N_PER_PAGE:2 * N_PER_PAGE], (
+        "Убедитесь, что курсор следующей страницы продолжает ленту "
+        "без пропусков и повторов."
+    )
+    assert 'Вперёд' not in links and 'Назад' in links
+
+    back, _ = get_page(user_client, f"/?cursor={links['Назад']}")
+    assert back == first, (
+        "Убедитесь, что курсор предыдущей страницы возвращает "
+        "к предыдущей странице ленты."
+    )
+
+
+def test_cursor_pagination_keeps_page_urls(
+        user_client, many_posts_with_published_locations, settings
+):
+    settings.FEED_CURSOR_PAGINATION = True
+    response = user_client.get('/?page=2')
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['page_obj'].number == 2, (
+        "Убедитесь, что ссылки вида `?page=` продолжают работать "
+        "при включённой курсорной пагинации."
+    )
+
+
+def test_invalid_cursor_returns_404(user_client):
+    response = user_client.get('/?cursor=not-a-cursor')
+    assert response.status_code == HTTPStatus.NOT_FOUND
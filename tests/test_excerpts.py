@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+from django.template.defaultfilters import truncatewords
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_excerpt_is_computed_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = ' '.join(['слово'] * 450)
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == truncatewords(post.text, 10), (
+        "Убедитесь, что анонс поста вычисляется при сохранении."
+    )
+    assert post.reading_time == 2
+
+
+def test_feed_query_does_not_load_text(post_with_published_location):
+    Post = type(post_with_published_location)
+    sql = str(Post.objects.published().for_card().query)
+    assert '"blog_post"."text"' not in sql, (
+        "Убедитесь, что ленты не загружают полный текст постов."
+    )
+
+
+def test_refresh_excerpts_command(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.update(excerpt='', reading_time=0)
+    updated_at = post.updated_at
+    call_command('refresh_excerpts', chunk_size=1)
+    post.refresh_from_db()
+    assert post.excerpt == truncatewords(post.text, 10)
+    assert post.reading_time >= 1
+    assert post.updated_at > updated_at, (
+        "Убедитесь, что команда `refresh_excerpts` обновляет `updated_at` "
+        "постов с пересчитанным анонсом."
+    )
+
+
+def test_text_html_is_rendered_on_save(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.text = '<b>Первая</b> строка\nвторая строка'
+    post.save()
+    expected = '&lt;b&gt;Первая&lt;/b&gt; строка<br>вторая строка'
+    assert post.text_html == expected, (
+        "Убедитесь, что HTML текста поста рендерится при сохранении."
+    )
+    content = user_client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert expected in content
+
+
+def test_render_posts_command(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.update(text_html='', text_html_version=0)
+    updated_at = post.updated_at
+    call_command('render_posts', chunk_size=1)
+    post.refresh_from_db()
+    assert post.text_html and post.text_html_version > 0, (
+        "Убедитесь, что команда `render_posts` перерендеривает посты "
+        "с устаревшей версией HTML."
+    )
+    assert post.updated_at > updated_at, (
+        "Убедитесь, что команда `render_posts` обновляет `updated_at` "
+        "перерендеренных постов."
+    )
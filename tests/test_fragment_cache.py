@@ -0,0 +1,39 @@
+import pytest
+from django.template.loader import render_to_string
+
+pytestmark = [pytest.mark.django_db]
+
+
+def render_card(post):
+    return render_to_string('includes/post_card.html', {'post': post})
+
+
+def test_post_card_fragment_follows_changes(post_with_published_location):
+    post = post_with_published_location
+    html = render_card(post)
+    assert render_card(post) == html
+
+    for obj, field, value in (
+        (post, 'title', 'Обновлённый заголовок'),
+        (post.category, 'title', 'Обновлённая категория'),
+        (post.location, 'name', 'Обновлённое место'),
+    ):
+        setattr(obj, field, value)
+        obj.save()
+        assert value in render_card(post), (
+            "Убедитесь, что кэш карточки поста сбрасывается при изменении "
+            "поста, его категории или местоположения."
+        )
+
+
+def test_comment_fragment_follows_changes(
+        user_client, comment_to_a_post
+):
+    comment = comment_to_a_post
+    url = f'/posts/{comment.post_id}/'
+    user_client.get(url)
+    comment.text = 'Отредактированный комментарий'
+    comment.save()
+    assert comment.text in user_client.get(url).content.decode('utf-8'), (
+        "Убедитесь, что кэш комментария сбрасывается при его изменении."
+    )
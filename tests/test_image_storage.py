@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+
+from fixtures.images import make_photo
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_stored_files(media_root):
+    return sorted(
+        path.relative_to(media_root).as_posix()
+        for path in media_root.rglob('*')
+        if path.is_file() and not path.name.startswith('.')
+    )
+
+
+def test_identical_uploads_are_stored_once(
+        mixer, media_root, post_with_photo
+):
+    copy = mixer.blend(
+        'blog.Post', category=post_with_photo.category,
+        image=make_photo(1600, 1000),
+    )
+    post_with_photo.refresh_from_db()
+    copy.refresh_from_db()
+    assert copy.image.name == post_with_photo.image.name, (
+        "Убедитесь, что одинаковые картинки сохраняются под одним "
+        "именем, вычисленным по их содержимому."
+    )
+    assert Path(copy.image.name).stem == copy.image_hash
+    originals = [
+        name for name in get_stored_files(media_root)
+        if '/variants/' not in name
+    ]
+    assert originals == [copy.image.name], (
+        "Убедитесь, что одинаковые загрузки хранятся одним файлом."
+    )
+    assert copy.image_variants == post_with_photo.image_variants, (
+        "Убедитесь, что повторная загрузка того же файла использует "
+        "уже нарезанные варианты."
+    )
+
+
+def test_file_is_removed_with_last_reference(
+        mixer, media_root, post_with_photo,
+        django_capture_on_commit_callbacks
+):
+    copy = mixer.blend(
+        'blog.Post', category=post_with_photo.category,
+        image=make_photo(1600, 1000),
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        post_with_photo.delete()
+    assert Path(copy.image.path).exists(), (
+        "Убедитесь, что файл картинки не удаляется, пока на него "
+        "ссылается другой пост."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        copy.image = make_photo(800, 600, color='navy')
+        copy.save()
+    assert all(
+        copy.image_hash in name for name in get_stored_files(media_root)
+    ), (
+        "Убедитесь, что файл картинки и её варианты удаляются, "
+        "когда на них больше не ссылается ни один пост."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        copy.delete()
+    assert get_stored_files(media_root) == []
+
+
+def test_upload_restores_file_released_before_commit(
+        mixer, media_root, post_with_photo,
+        django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        copy = mixer.blend(
+            'blog.Post', category=post_with_photo.category,
+            image=make_photo(1600, 1000),
+        )
+        # Параллельный release_image удалил файл до коммита нового поста
+        Path(copy.image.path).unlink()
+    assert Path(copy.image.path).read_bytes() == (
+        make_photo(1600, 1000).read()), (
+        "Убедитесь, что загруженный файл записывается заново, если его "
+        "удалили, пока новый пост с ним не был закоммичен."
+    )
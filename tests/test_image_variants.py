@@ -0,0 +1,90 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_variants_are_made_on_upload(post_with_photo):
+    post = post_with_photo
+    post.refresh_from_db()
+    assert post.image_variants == {
+        'name': post.image.name,
+        'sizes': [[640, 640, 400], [960, 960, 600], [1280, 1280, 800]],
+    }, (
+        "Убедитесь, что при загрузке картинки поста создаются варианты "
+        "под ширину карточки, страницы поста и 2x, но не шире оригинала."
+    )
+    variants = sorted(
+        path.name for path in (Path(post.image.path).parent / 'variants')
+        .iterdir()
+    )
+    stem = Path(post.image.name).stem
+    assert variants == sorted(
+        f'{stem}_{width}.{extension}'
+        for width in (640, 960, 1280) for extension in ('jpg', 'webp')
+    ), "Убедитесь, что варианты сохраняются в форматах WebP и JPEG."
+
+
+def test_cards_use_srcset(client, post_with_photo):
+    content = client.get('/').content.decode('utf-8')
+    assert content.count('<img class="border-3') == 1
+    assert 'type="image/webp"' in content and ' 1280w' in content, (
+        "Убедитесь, что карточка поста выводит варианты картинки "
+        "через `srcset` с WebP."
+    )
+    assert 'width="640" height="400"' in content, (
+        "Убедитесь, что у картинки в карточке указаны ширина и высота."
+    )
+    assert ' 1920w' not in content
+
+
+def test_make_image_variants_command(post_with_photo):
+    post_model = type(post_with_photo)
+    post_model.objects.update(image_variants={})
+
+    call_command('make_image_variants', workers=1)
+
+    post_with_photo.refresh_from_db()
+    assert post_with_photo.card_image is not None, (
+        "Убедитесь, что команда `make_image_variants` создаёт варианты "
+        "для уже загруженных картинок."
+    )
+
+
+def test_image_metadata_is_stored_on_upload(post_with_photo):
+    post = post_with_photo
+    post.refresh_from_db()
+    content = post.image.read()
+    assert (
+        post.image_width, post.image_height, post.image_size, post.image_hash
+    ) == (1600, 1000, len(content), hashlib.sha256(content).hexdigest()), (
+        "Убедитесь, что при загрузке картинки в посте сохраняются её "
+        "ширина, высота, размер в байтах и хэш содержимого."
+    )
+
+
+def test_fill_image_metadata_command(post_with_photo):
+    post_model = type(post_with_photo)
+    post_model.objects.update(
+        image_width=None, image_height=None, image_size=None, image_hash='')
+    post_with_photo.refresh_from_db()
+    updated_at = post_with_photo.updated_at
+    card_cache_version = post_with_photo.card_cache_version
+
+    call_command('fill_image_metadata')
+
+    post_with_photo.refresh_from_db()
+    assert post_with_photo.updated_at > updated_at
+    assert post_with_photo.card_cache_version != card_cache_version, (
+        "Убедитесь, что размеры картинки входят в версию кэша карточки: "
+        "они выводятся в атрибутах width и height."
+    )
+    assert (post_with_photo.image_width, post_with_photo.image_height) == (
+        1600, 1000), (
+        "Убедитесь, что команда `fill_image_metadata` заполняет "
+        "метаданные уже загруженных картинок."
+    )
+    assert post_with_photo.image_size and post_with_photo.image_hash
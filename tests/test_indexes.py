@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.paginators import (
+    NEXT, PREVIOUS, CommentCursorPaginator, CursorPaginator,
+)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN of SQLite'
+    ),
+]
+
+
+def get_feed_querysets(category, author, post_id):
+    return (
+        (
+            'post_published_feed_idx',
+            Post.objects.published().for_card().order_by('-pub_date'),
+        ),
+        (
+            'post_category_feed_idx',
+            Post.objects.published().filter(
+                category=category
+            ).for_card().order_by('-pub_date'),
+        ),
+        (
+            'post_author_feed_idx',
+            Post.objects.filter(author=author).for_card().order_by(
+                '-pub_date'),
+        ),
+        (
+            'comment_post_created_idx',
+            Comment.objects.filter(post=post_id).order_by('created_at'),
+        ),
+    )
+
+
+def test_feed_queries_use_indexes(published_category, user):
+    for index_name, queryset in get_feed_querysets(
+            published_category, user, 1
+    ):
+        plan = queryset.explain()
+        assert f'USING INDEX {index_name}' in plan, (
+            f"Убедитесь, что запрос использует индекс `{index_name}`:\n"
+            f"{plan}"
+        )
+        assert 'SCAN blog_post' not in plan, (
+            f"Убедитесь, что запрос не сканирует таблицу целиком:\n{plan}"
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f"Убедитесь, что сортировка выполняется по индексу:\n{plan}"
+        )
+
+
+def get_cursor_page_sql(paginator, cursor):
+    """SQL запроса страницы, которую отдаёт курсор."""
+    with CaptureQueriesContext(connection) as queries:
+        paginator.page(cursor)
+    return queries.captured_queries[-1]['sql']
+
+
+def count_vm_steps(paginator, cursor):
+    """Число шагов виртуальной машины SQLite на выборку страницы."""
+    steps = [0]
+
+    def count():
+        steps[0] += 1
+        return 0
+
+    connection.ensure_connection()
+    connection.connection.set_progress_handler(count, 10)
+    try:
+        paginator.page(cursor)
+    finally:
+        connection.connection.set_progress_handler(None, 10)
+    return steps[0]
+
+
+@pytest.fixture
+def deep_feed(user, published_category):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title='Пост', text='Текст', author=user,
+            category=published_category, is_published=True,
+            pub_date=now - timedelta(minutes=minutes),
+        )
+        for minutes in range(1, 1001)
+    )
+    post = Post.objects.earliest('pub_date')
+    Comment.objects.bulk_create(
+        Comment(
+            text='Комментарий', author=user, post=post,
+            created_at=now - timedelta(minutes=minutes),
+        )
+        for minutes in range(1, 1001)
+    )
+    return post
+
+
+def get_cursor_paginators(post):
+    return (
+        ('post_published_feed_idx', 'pub_date<?', 'pub_date>?',
+         CursorPaginator(Post.objects.published().for_card(), 10)),
+        ('post_category_feed_idx', 'pub_date<?', 'pub_date>?',
+         CursorPaginator(Post.objects.published().filter(
+             category=post.category).for_card(), 10)),
+        ('post_author_feed_idx', 'pub_date<?', 'pub_date>?',
+         CursorPaginator(Post.objects.filter(
+             author=post.author).for_card(), 10)),
+        ('comment_post_created_idx', 'created_at>?', 'created_at<?',
+         CommentCursorPaginator(Comment.objects.filter(post=post), 10)),
+    )
+
+
+def get_cursor(paginator, direction, position):
+    ordering = paginator.get_ordering(True)
+    obj = paginator.queryset.order_by(*ordering)[position]
+    return paginator.encode_cursor(direction, obj)
+
+
+def test_cursor_pages_seek_into_indexes(deep_feed):
+    for index_name, next_bound, previous_bound, paginator in (
+            get_cursor_paginators(deep_feed)):
+        for direction, bound in ((NEXT, next_bound),
+                                 (PREVIOUS, previous_bound)):
+            sql = get_cursor_page_sql(
+                paginator, get_cursor(paginator, direction, 500))
+            plan = '\n'.join(
+                ' '.join(map(str, row)) for row in connection.cursor()
+                .execute(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+            )
+            assert f'USING INDEX {index_name}' in plan and bound in plan, (
+                "Убедитесь, что страница курсорной пагинации начинает "
+                f"чтение индекса `{index_name}` с курсора:\n{plan}"
+            )
+
+
+def test_cursor_page_cost_does_not_depend_on_depth(deep_feed):
+    for index_name, _, _, paginator in get_cursor_paginators(deep_feed):
+        for direction in (NEXT, PREVIOUS):
+            shallow = count_vm_steps(
+                paginator, get_cursor(paginator, direction, 20))
+            deep = count_vm_steps(
+                paginator, get_cursor(paginator, direction, 950))
+            assert deep < shallow * 2, (
+                "Убедитесь, что глубокая страница курсорной пагинации "
+                f"по `{index_name}` не дороже первых страниц: "
+                f"{deep} шагов против {shallow}."
+            )
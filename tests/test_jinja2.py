@@ -0,0 +1,134 @@
+import re
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.template import engines
+from django.urls import reverse
+
+from blogicum.templating import precompile_templates
+
+pytestmark = [pytest.mark.django_db]
+
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+
+def render_with(settings, client, url, engine):
+    settings.BLOG_TEMPLATE_ENGINE = engine
+    cache.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    content = response.content.decode(response.charset)
+    # Токен CSRF маскируется заново при каждом рендере
+    return CSRF_RE.sub('name="csrfmiddlewaretoken"', content)
+
+
+def assert_same_html(settings, client, *urls):
+    for url in urls:
+        django_html = render_with(settings, client, url, 'django')
+        jinja2_html = render_with(settings, client, url, 'jinja2')
+        assert jinja2_html == django_html, (
+            f"Убедитесь, что шаблоны Jinja2 для `{url}` выдают тот же HTML, "
+            "что и шаблоны Django."
+        )
+
+
+@pytest.fixture
+def tricky_post(post_with_published_location, mixer, user):
+    post = post_with_published_location
+    post.title = 'Кавычки "двойные" и \'одинарные\' <b>&</b>'
+    post.text = 'Первая строка\nвторая <i>строка</i>'
+    post.save()
+    mixer.cycle(3).blend(
+        'blog.Comment', post=post, author=user, text='Ответ\n"в кавычках"')
+    return post
+
+
+def test_feed_pages_match(
+        settings, client, user_client, tricky_post,
+        many_posts_with_published_locations, published_category):
+    for view_client in (client, user_client):
+        assert_same_html(
+            settings, view_client,
+            reverse('blog:index'),
+            reverse('blog:index') + '?page=2',
+            reverse('blog:index') + '?cursor=',
+            reverse('blog:category_posts', args=[published_category.slug]),
+            reverse('blog:profile', args=[tricky_post.author.username]),
+            reverse('blog:search') + '?q=Кавычки',
+            reverse('blog:search') + '?q=нет-такого',
+        )
+
+
+def test_post_pages_match(settings, client, user_client, tricky_post):
+    assert_same_html(
+        settings, client,
+        reverse('blog:post_detail', args=[tricky_post.id]),
+        reverse('blog:post_comments', args=[tricky_post.id]),
+    )
+    comment = tricky_post.comments.first()
+    assert_same_html(
+        settings, user_client,
+        reverse('blog:post_detail', args=[tricky_post.id]),
+        reverse('blog:create_post'),
+        reverse('blog:edit_post', args=[tricky_post.id]),
+        reverse('blog:delete_post', args=[tricky_post.id]),
+        reverse('blog:edit_comment', args=[tricky_post.id, comment.id]),
+        reverse('blog:delete_comment', args=[tricky_post.id, comment.id]),
+        reverse('blog:edit_profile'),
+    )
+
+
+def test_responsive_image_matches(settings, client, post_with_photo):
+    post_with_photo.refresh_from_db()
+    assert post_with_photo.image_variants
+    assert_same_html(
+        settings, client,
+        reverse('blog:index'),
+        reverse('blog:post_detail', args=[post_with_photo.id]),
+    )
+
+
+def test_jinja2_backend_is_used(
+        settings, client, post_with_published_location):
+    settings.BLOG_TEMPLATE_ENGINE = 'jinja2'
+    response = client.get(reverse('blog:index'))
+    assert response.templates == [], (
+        "Убедитесь, что при BLOG_TEMPLATE_ENGINE = 'jinja2' страницы "
+        "блога рендерятся движком Jinja2."
+    )
+    assert post_with_published_location.title in response.content.decode()
+
+
+def test_fragment_cache_is_shared(
+        settings, client, post_with_published_location):
+    settings.BLOG_TEMPLATE_ENGINE = 'jinja2'
+    client.get(reverse('blog:index'))
+    settings.BLOG_TEMPLATE_ENGINE = 'django'
+    template = engines['django'].from_string(
+        '{% load cache %}{% cache 1 post_card post.id post.card_cache_version'
+        ' %}не из кэша{% endcache %}'
+    )
+    html = template.render({'post': post_with_published_location})
+    assert 'не из кэша' not in html, (
+        "Убедитесь, что тег cache в Jinja2 использует те же ключи кэша "
+        "фрагментов, что и шаблоны Django."
+    )
+
+
+def test_precompile_reports_broken_jinja2_templates(settings, tmp_path):
+    (tmp_path / 'broken.html').write_text('{% if %}', encoding='utf-8')
+    django_backend, jinja2_backend = settings.TEMPLATES
+    settings.TEMPLATES = [
+        django_backend, {**jinja2_backend, 'DIRS': [tmp_path]}]
+    with pytest.raises(ImproperlyConfigured, match='broken.html'):
+        precompile_templates()
+
+
+def test_benchmark_templates_command(
+        capsys, many_posts_with_published_locations):
+    call_command('benchmark_templates', '/', repeat=1)
+    output = capsys.readouterr().out
+    assert 'blog/index.html' in output
+    assert 'django' in output and 'jinja2' in output
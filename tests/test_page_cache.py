@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_cached(
+        client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert not context.captured_queries, (
+            f"Убедитесь, что повторный анонимный запрос к `{url}` "
+            "отдаётся из кэша без обращения к БД."
+        )
+
+    post.title = 'Новый заголовок публикации'
+    post.save()
+    for url in urls:
+        assert post.title in client.get(url).content.decode('utf-8'), (
+            f"Убедитесь, что кэш страницы `{url}` сбрасывается "
+            "при изменении публикации."
+        )
+
+    response = user_client.get(urls[0])
+    assert response.context is not None, (
+        "Убедитесь, что страницы авторизованных пользователей не кэшируются."
+    )
@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+def test_feed_query_count_independent_of_posts(
+        mixer, user, user_client, published_category, published_location
+):
+    urls = (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    single_post_queries = {url: count_queries(user_client, url)
+                           for url in urls}
+
+    mixer.cycle(N_PER_PAGE - 1).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    for url in urls:
+        assert count_queries(user_client, url) == single_post_queries[url], (
+            f"Убедитесь, что число запросов к БД на странице `{url}` "
+            "не зависит от количества публикаций на ней."
+        )
@@ -0,0 +1,155 @@
+import re
+from collections import Counter
+from urllib.parse import urlencode
+
+import pytest
+from django.contrib.auth import urls as auth_urls
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from blog import urls as blog_urls
+from blogicum import urls as root_urls
+from pages import urls as pages_urls
+from query_budgets import QUERY_BUDGETS
+
+pytestmark = [pytest.mark.django_db]
+
+ROLES = ('anonymous', 'author', 'other')
+SEED_POSTS = 12
+SEED_COMMENTS = 5
+
+
+def get_route_names():
+    names = [
+        f'{module.app_name}:{pattern.name}'
+        for module in (blog_urls, pages_urls)
+        for pattern in module.urlpatterns
+    ]
+    names += [pattern.name for pattern in auth_urls.urlpatterns]
+    names += [
+        pattern.name for pattern in root_urls.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name
+    ]
+    return names
+
+
+ROUTE_NAMES = get_route_names()
+
+
+def get_route_kwargs(name, seed):
+    post, comment, category, author = (
+        seed['post'], seed['comment'], seed['category'], seed['author']
+    )
+    return {
+        'blog:post_detail': {'post_id': post.id},
+        'blog:post_comments': {'post_id': post.id},
+        'blog:edit_post': {'post_id': post.id},
+        'blog:delete_post': {'post_id': post.id},
+        'blog:add_comment': {'post_id': post.id},
+        'blog:edit_comment': {'post_id': post.id, 'comment_id': comment.id},
+        'blog:delete_comment': {
+            'post_id': post.id, 'comment_id': comment.id
+        },
+        'blog:category_posts': {'category_slug': category.slug},
+        'blog:profile': {'username': author.username},
+        'password_reset_confirm': {
+            'uidb64': urlsafe_base64_encode(force_bytes(author.pk)),
+            'token': default_token_generator.make_token(author),
+        },
+    }.get(name, {})
+
+
+def get_route_query(name, seed):
+    """Строка запроса, без которой маршрут не выполняет свою работу."""
+    return {
+        'blog:search': '?' + urlencode(
+            {'q': seed['post'].title.split()[0]}),
+    }.get(name, '')
+
+
+def normalize_sql(sql):
+    return re.sub(r"'[^']*'|\b\d+(\.\d+)?\b", '?', sql)
+
+
+def format_queries(queries):
+    """Список запросов с пометкой повторяющихся (признак N+1)."""
+    repeated = Counter(normalize_sql(query['sql']) for query in queries)
+    lines = []
+    for number, query in enumerate(queries, 1):
+        times = repeated[normalize_sql(query['sql'])]
+        mark = f' [x{times}]' if times > 1 else ''
+        lines.append(f"{number:3}.{mark} ({query['time']}s) {query['sql']}")
+    return '\n'.join(lines)
+
+
+@pytest.fixture
+def seed(mixer):
+    author, other = mixer.cycle(2).blend('auth.User')
+    category = mixer.blend('blog.Category', is_published=True)
+    location = mixer.blend('blog.Location', is_published=True)
+    posts = mixer.cycle(SEED_POSTS).blend(
+        'blog.Post', author=author, category=category, location=location,
+        is_published=True,
+    )
+    post = posts[0]
+    comments = mixer.cycle(SEED_COMMENTS).blend(
+        'blog.Comment', post=post, author=mixer.sequence(author, other),
+    )
+    return {
+        'author': author,
+        'other': other,
+        'category': category,
+        'post': post,
+        'comment': comments[0],
+    }
+
+
+def get_role_client(role, seed):
+    client = Client()
+    if role != 'anonymous':
+        client.force_login(seed[role])
+    return client
+
+
+def test_every_route_has_budget():
+    missing = [name for name in ROUTE_NAMES if name not in QUERY_BUDGETS]
+    assert not missing, (
+        "Добавьте бюджет запросов в `tests/query_budgets.py` "
+        f"для маршрутов: {', '.join(missing)}"
+    )
+
+
+@pytest.mark.parametrize('role', ROLES)
+@pytest.mark.parametrize('name', ROUTE_NAMES)
+def test_route_query_budget(name, role, seed, record_property):
+    expected = QUERY_BUDGETS.get(name, {}).get(role)
+    if expected is None:
+        pytest.skip(f'Нет бюджета для {name} ({role})')
+    budget, status = expected
+    client = get_role_client(role, seed)
+    url = reverse(name, kwargs=get_route_kwargs(name, seed))
+    url += get_route_query(name, seed)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+
+    queries = context.captured_queries
+    count = len(queries)
+    total_time = sum(float(query['time']) for query in queries)
+    record_property('queries', count)
+    record_property('query_time', f'{total_time:.4f}')
+    assert response.status_code == status, (
+        f"Страница `{url}` ({role}) вернула код {response.status_code} "
+        f"вместо {status}: бюджет {budget} запросов к БД проверяется "
+        "только на ожидаемом ответе."
+    )
+    assert count <= budget, (
+        f"Страница `{url}` ({role}) выполняет {count} запросов к БД "
+        f"при бюджете {budget} ({total_time:.4f}s, код "
+        f"{response.status_code}):\n{format_queries(queries)}"
+    )
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+from blog.signals import restore_search_triggers
+
+pytestmark = [pytest.mark.django_db]
+
+
+def search(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что страница поиска `/search/` отображается без ошибок."
+    )
+    return list(response.context['page_obj'])
+
+
+def test_search_ranks_published_posts(
+        mixer, client, user, published_category
+):
+    in_title = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Ёжики в тумане', text='Короткая история.',
+    )
+    in_text = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Прогулка', text='По дороге встретились ежики и белки.',
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Ежик снят с публикации', text='', is_published=False,
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Про котов', text='Ничего общего.',
+    )
+
+    assert search(client, 'ежик') == [in_title, in_text], (
+        "Убедитесь, что поиск находит опубликованные посты по началу слова "
+        "без учёта регистра и буквы «ё» и ставит совпадения в заголовке выше."
+    )
+
+    in_title.title = 'Белки в лесу'
+    in_title.save()
+    assert search(client, 'ежик') == [in_text], (
+        "Убедитесь, что поисковый индекс обновляется при изменении поста."
+    )
+
+
+def test_search_handles_special_characters(client):
+    assert search(client, '"AND (OR* -') == []
+    assert search(client, '') == []
+
+
+def test_search_composes_with_queryset_methods(
+        mixer, user, published_category
+):
+    older, newer = (
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title=title, text='Про ежиков.', pub_date=pub_date,
+        )
+        for title, pub_date in (
+            ('Ежики', timezone.now() - timedelta(days=2)),
+            ('Белки', timezone.now() - timedelta(days=1)),
+        )
+    )
+    found = Post.objects.published().search('ежик')
+    assert list(found) == [older, newer]
+    assert list(
+        found.only('title').order_by('-pub_date')
+    ) == [newer, older], (
+        "Убедитесь, что результаты поиска можно пересортировать "
+        "и ограничить загружаемые поля."
+    )
+    assert found.filter(title='Белки').count() == 1
+    assert found.values_list('title', flat=True).first() == 'Ежики'
+
+
+def count_search_steps(query):
+    """Шаги виртуальной машины SQLite на первую страницу и её счётчик."""
+    steps = [0]
+
+    def count():
+        steps[0] += 1
+        return 0
+
+    connection.ensure_connection()
+    connection.connection.set_progress_handler(count, 10)
+    try:
+        found = Post.objects.published().search(query)
+        found.count()
+        list(found.for_card()[:10])
+    finally:
+        connection.connection.set_progress_handler(None, 10)
+    return steps[0]
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 в SQLite')
+def test_search_cost_grows_linearly(user, published_category):
+    costs = []
+    for matches in (200, 1600):
+        Post.objects.all().delete()
+        Post.objects.bulk_create(
+            Post(
+                title=f'Пост {number}', text='Короткая история про ежиков.',
+                author=user, category=published_category,
+                pub_date=timezone.now() - timedelta(minutes=number),
+            )
+            for number in range(matches)
+        )
+        costs.append(count_search_steps('история'))
+    small, large = costs
+    # В 8 раз больше совпадений — не больше чем в 10 раз дороже
+    assert large < small * 10, (
+        "Убедитесь, что цена поиска растёт не быстрее числа совпадений: "
+        "MATCH и bm25() считаются один раз на запрос, а не на каждый пост "
+        f"({small} шагов на 200 совпадений, {large} на 1600)."
+    )
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 в SQLite')
+def test_post_migrate_restores_search_triggers(
+        mixer, client, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Ежики', text='',
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('DROP TRIGGER blog_post_fts_update')
+        # Посторонний триггер не заменяет недостающий
+        cursor.execute(
+            'CREATE TRIGGER blog_post_touch AFTER UPDATE ON blog_post '
+            'BEGIN SELECT 1; END'
+        )
+    restore_search_triggers(apps.get_app_config('blog'), using='default')
+
+    post.title = 'Белки'
+    post.save()
+    assert search(client, 'белк') == [post], (
+        "Убедитесь, что после миграций недостающие триггеры поискового "
+        "индекса восстанавливаются по именам."
+    )
+    assert search(client, 'ежик') == []
@@ -0,0 +1,82 @@
+import gzip
+import json
+import re
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.test import RequestFactory
+from django_bootstrap5.core import get_bootstrap_setting
+
+from blogicum.staticfiles import brotli, serve_static
+
+CSS = 'css/bootstrap.min.css'
+
+
+@pytest.fixture(scope='module')
+def static_root(tmp_path_factory):
+    return tmp_path_factory.mktemp('static')
+
+
+@pytest.fixture
+def collected(settings, static_root):
+    settings.STATIC_ROOT = static_root
+    settings.STATICFILES_STORAGE = (
+        'blogicum.staticfiles.CompressedManifestStaticFilesStorage')
+    if not (static_root / 'staticfiles.json').exists():
+        call_command('collectstatic', interactive=False, verbosity=0)
+    manifest = json.loads((static_root / 'staticfiles.json').read_text())
+    return manifest['paths']
+
+
+def test_collectstatic_hashes_and_precompresses(collected, static_root):
+    hashed = collected.get(CSS)
+    assert hashed and hashed != CSS, (
+        "Убедитесь, что collectstatic добавляет хэш содержимого "
+        "в имена статических файлов."
+    )
+    original = (static_root / hashed).read_bytes()
+    assert gzip.decompress(
+        (static_root / f'{hashed}.gz').read_bytes()) == original, (
+        "Убедитесь, что рядом со статикой сохраняется сжатая копия `.gz`."
+    )
+    if brotli is not None:
+        assert brotli.decompress(
+            (static_root / f'{hashed}.br').read_bytes()) == original
+
+
+def test_hashed_static_is_served_immutable(collected):
+    hashed = collected[CSS]
+    request = RequestFactory().get(
+        f'/static/{hashed}', HTTP_ACCEPT_ENCODING='gzip, deflate')
+    response = serve_static(request, hashed)
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'].startswith('text/css')
+    assert 'Accept-Encoding' in response['Vary']
+    assert 'immutable' in response['Cache-Control'], (
+        "Убедитесь, что статика с хэшем в имени отдаётся "
+        "с `Cache-Control: immutable`."
+    )
+
+    response = serve_static(RequestFactory().get(f'/static/{CSS}'), CSS)
+    assert 'Content-Encoding' not in response
+    assert 'immutable' not in response['Cache-Control']
+
+
+@pytest.mark.django_db
+def test_bootstrap_is_served_locally(client):
+    content = client.get('/').content.decode('utf-8')
+    assert f'/static/{CSS}' in content and 'cdn.jsdelivr' not in content, (
+        "Убедитесь, что CSS Bootstrap подключается из локальной статики."
+    )
+
+
+def test_vendored_bootstrap_is_not_older_than_cdn():
+    cdn_version = re.search(
+        r'bootstrap@(\d+)\.(\d+)', get_bootstrap_setting('css_url')['url'])
+    with open(finders.find(CSS), encoding='utf-8') as file:
+        vendored_version = re.search(r'Bootstrap +v(\d+)\.(\d+)', file.read())
+    assert vendored_version.groups() == cdn_version.groups(), (
+        "Убедитесь, что локальная копия CSS Bootstrap той же версии, "
+        "что подключал тег bootstrap_css."
+    )
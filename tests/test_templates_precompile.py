@@ -0,0 +1,69 @@
+import importlib
+import sys
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.template import engines
+
+from blogicum.templating import precompile_templates
+
+PRODUCTION_SETTINGS = 'blogicum.settings_production'
+
+
+@pytest.fixture
+def production_settings(monkeypatch):
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'production-secret')
+    monkeypatch.setenv('DJANGO_ALLOWED_HOSTS', 'blogicum.ru, www.blogicum.ru')
+    sys.modules.pop(PRODUCTION_SETTINGS, None)
+    yield importlib.import_module(PRODUCTION_SETTINGS)
+    sys.modules.pop(PRODUCTION_SETTINGS, None)
+
+
+@pytest.fixture
+def cached_templates(settings, production_settings):
+    settings.TEMPLATES = production_settings.TEMPLATES
+    return engines['django'].engine
+
+
+def test_production_settings(production_settings):
+    assert production_settings.DEBUG is False
+    assert production_settings.SECRET_KEY == 'production-secret'
+    assert production_settings.ALLOWED_HOSTS == [
+        'blogicum.ru', 'www.blogicum.ru']
+    assert 'debug_toolbar' not in production_settings.INSTALLED_APPS
+    assert not any(
+        'debug_toolbar' in middleware
+        for middleware in production_settings.MIDDLEWARE
+    )
+    (loader, _), = production_settings.TEMPLATES[0]['OPTIONS']['loaders']
+    assert loader == 'django.template.loaders.cached.Loader', (
+        "Убедитесь, что в боевых настройках шаблоны загружаются "
+        "кэширующим загрузчиком."
+    )
+    assert production_settings.TEMPLATES_PRECOMPILE is True
+    assert production_settings.CACHES['default']['BACKEND'] == (
+        'django.core.cache.backends.memcached.PyMemcacheCache'), (
+        "Убедитесь, что в боевых настройках кэш общий для всех процессов: "
+        "сигналы сбрасывают кэш страниц сменой ключа."
+    )
+
+
+def test_precompile_fills_cached_loader(cached_templates):
+    cached_loader, = cached_templates.template_loaders
+    assert not cached_loader.get_template_cache
+    compiled = precompile_templates()
+    assert compiled > 0
+    for name in ('blog/index.html', 'blog/detail.html', 'base.html'):
+        assert name in cached_loader.get_template_cache, (
+            "Убедитесь, что precompile_templates разбирает все шаблоны "
+            "и кладёт их в кэш загрузчика до первого запроса."
+        )
+
+
+def test_precompile_reports_broken_templates(
+        settings, production_settings, tmp_path):
+    (tmp_path / 'broken.html').write_text('{% if %}', encoding='utf-8')
+    templates = production_settings.TEMPLATES
+    settings.TEMPLATES = [{**templates[0], 'DIRS': [tmp_path]}]
+    with pytest.raises(ImproperlyConfigured, match='broken.html'):
+        precompile_templates()
@@ -0,0 +1,87 @@
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.forms import AddPostForm
+from blog.uploads import OversizedUpload
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_jpeg(width, height):
+    buffer = BytesIO()
+    Image.effect_noise((width, height), 100).convert('RGB').save(
+        buffer, 'JPEG')
+    return SimpleUploadedFile(
+        'photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+def make_png_header(width, height):
+    """PNG без пиксельных данных, заголовок которого обещает width x height."""
+    def chunk(kind, data):
+        return (
+            struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data))
+        )
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return SimpleUploadedFile(
+        'bomb.png',
+        b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IEND', b''),
+        content_type='image/png',
+    )
+
+
+def get_form(category, image):
+    return AddPostForm(
+        data={
+            'title': 'Заголовок',
+            'text': 'Текст',
+            'pub_date': '2024-01-01T10:00',
+            'category': category.pk,
+        },
+        files={'image': image},
+    )
+
+
+def test_oversized_upload_is_cut_while_streaming(
+        settings, user_client, published_category
+):
+    settings.POST_IMAGE_MAX_SIZE = 4 * 1024
+    response = user_client.post('/posts/create/', {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': '2024-01-01T10:00',
+        'category': published_category.pk,
+        'image': make_jpeg(200, 200),
+    })
+    upload = response.wsgi_request.FILES['image']
+    assert isinstance(upload, OversizedUpload), (
+        "Убедитесь, что загрузка файла больше `POST_IMAGE_MAX_SIZE` "
+        "прерывается без сохранения его содержимого."
+    )
+    assert 'image' in response.context['form'].errors, (
+        "Убедитесь, что форма поста сообщает о превышении размера файла."
+    )
+
+
+def test_too_many_pixels_rejected_before_decode(settings, published_category):
+    form = get_form(published_category, make_png_header(100_000, 100_000))
+    assert not form.is_valid()
+    assert form.errors['image'][0].startswith(
+        'Изображение не должно быть больше'), (
+        "Убедитесь, что картинки с числом пикселей больше "
+        "`POST_IMAGE_MAX_PIXELS` отклоняются по заголовку файла."
+    )
+
+    settings.POST_IMAGE_MAX_PIXELS = 100
+    form = get_form(published_category, make_jpeg(20, 20))
+    assert 'image' in form.errors
+
+
+def test_image_within_limits_accepted(published_category):
+    form = get_form(published_category, make_jpeg(20, 20))
+    assert form.is_valid(), form.errors